@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Benchmark per-format render throughput of the exporters.
+
+Uses the offline rule engine to build a representative assessment, so no
+API key is needed:
+
+    python benchmarks/render_throughput.py --hazards 20 --seconds 2
+"""
+
+import argparse
+import time
+
+from risk_assessment_generator.exporters import RENDERERS, AssessmentView
+from risk_assessment_generator.models import AgeGroup
+from risk_assessment_generator.rule_engine import RuleEngine
+
+
+def build_assessment(hazard_count: int):
+    """Build an assessment with roughly hazard_count hazards."""
+    assessment = RuleEngine().identify_hazards(
+        activity_name="Farm Trip",
+        activity_description=(
+            "Trip to the farm by bus with a picnic lunch, feeding animals, "
+            "water play, climbing on hay bales and threading ribbons"
+        ),
+        location="Park",
+        age_groups=[AgeGroup.TODDLER, AgeGroup.RECEPTION],
+    )
+    base = assessment.hazards
+    assessment.hazards = [base[i % len(base)] for i in range(hazard_count)]
+    return assessment
+
+
+def bench(renderer, view, seconds: float) -> tuple[int, int, float]:
+    """Render repeatedly for about the given time; return (docs, bytes, elapsed)."""
+    docs = 0
+    size = 0
+    start = time.perf_counter()
+    while True:
+        for chunk in renderer.render(view):
+            size += len(chunk)
+        docs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return docs, size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hazards", type=int, default=8, help="Hazards per assessment (default: 8)")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Time per format (default: 1.0)")
+    parser.add_argument(
+        "--formats",
+        default=",".join(RENDERERS),
+        help=f"Comma-separated formats (default: {','.join(RENDERERS)})",
+    )
+    args = parser.parse_args()
+
+    assessment = build_assessment(args.hazards)
+
+    start = time.perf_counter()
+    view = AssessmentView.from_assessment(assessment)
+    view_us = (time.perf_counter() - start) * 1e6
+
+    print(f"{len(assessment.hazards)} hazards, view model built in {view_us:.0f}us")
+    print(f"{'format':<8}{'docs/s':>12}{'ms/doc':>10}{'KB/doc':>10}{'MB/s':>10}")
+    for name in args.formats.split(","):
+        docs, size, elapsed = bench(RENDERERS[name.strip()], view, args.seconds)
+        print(
+            f"{name:<8}{docs / elapsed:>12.1f}{elapsed / docs * 1000:>10.2f}"
+            f"{size / docs / 1024:>10.1f}{size / elapsed / 1e6:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,15 +11,23 @@ from .models import (
     RiskAssessment,
     Severity,
 )
+from .analytics import HazardTable
 from .hazard_identifier import HazardIdentifier
+from .model_router import ModelRouter, ModelTier
+from .rule_engine import HazardRule, RuleEngine
 
 __all__ = [
     "AgeGroup",
     "Hazard",
     "HazardIdentifier",
+    "HazardRule",
+    "HazardTable",
     "HazardWithMitigation",
     "Likelihood",
     "MitigationStrategy",
+    "ModelRouter",
+    "ModelTier",
     "RiskAssessment",
+    "RuleEngine",
     "Severity",
 ]
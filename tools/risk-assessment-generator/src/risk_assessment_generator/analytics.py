@@ -0,0 +1,434 @@
+"""Cross-assessment analytics over stored risk assessments.
+
+Hazards from many assessments are flattened into an in-memory columnar
+table. String columns are dictionary-encoded into integer arrays, so
+filters and group-by counts run over compact ``array`` buffers rather than
+model objects - fast enough for group-wide queries over a million hazards.
+"""
+
+import argparse
+import json
+import sys
+import threading
+from array import array
+from collections import Counter
+from itertools import product
+from pathlib import Path
+from typing import Iterable, Optional, Sequence, Union
+
+from .models import AgeGroup, RiskAssessment
+
+HAZARD_COLUMNS = (
+    "activity",
+    "location",
+    "hazard",
+    "severity",
+    "likelihood",
+    "risk_level",
+    "residual_risk",
+    "who_at_risk",
+)
+CONTROL_COLUMNS = ("responsible_person", "action")
+AGE_GROUP_COLUMN = "age_group"
+COLUMNS = HAZARD_COLUMNS + (AGE_GROUP_COLUMN,) + CONTROL_COLUMNS
+
+AGE_GROUP_BITS = {ag: 1 << i for i, ag in enumerate(AgeGroup)}
+
+Where = dict[str, Union[str, Sequence[str]]]
+
+
+class Column:
+    """A dictionary-encoded string column."""
+
+    def __init__(self):
+        self.values: list[str] = []
+        self.codes = array("i")
+        self._lookup: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def append(self, value: str) -> int:
+        """Append a value, adding it to the dictionary if new; returns its code."""
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self._lookup[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+        return code
+
+    def codes_for(self, values: Iterable[str]) -> set[int]:
+        """Return the codes of the given values, ignoring unknown ones."""
+        return {self._lookup[v] for v in values if v in self._lookup}
+
+
+class HazardTable:
+    """Columnar table of hazards and their additional controls.
+
+    Each hazard is one row. Additional controls live in a second table that
+    references hazard rows. Filtering on ``responsible_person`` or
+    ``action`` selects hazards with a matching control; grouping on them
+    counts controls. Adding and querying are safe across threads.
+    """
+
+    def __init__(self):
+        self._columns = {name: Column() for name in HAZARD_COLUMNS}
+        self._age_groups = array("i")
+        self._control_columns = {name: Column() for name in CONTROL_COLUMNS}
+        self._control_hazard = array("i")
+        # Per control column and value code, the sorted unique hazard rows
+        self._control_postings: dict[str, list[array]] = {name: [] for name in CONTROL_COLUMNS}
+        self._joined: dict[str, array] = {}
+        self.assessment_count = 0
+        # Adds write several arrays and queries extend the joined columns
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._age_groups)
+
+    @classmethod
+    def from_assessments(cls, assessments: Iterable[RiskAssessment]) -> "HazardTable":
+        """Build a table from risk assessments."""
+        table = cls()
+        for assessment in assessments:
+            table.add(assessment)
+        return table
+
+    def add(self, assessment: RiskAssessment) -> None:
+        """Append every hazard of an assessment to the table."""
+        mask = 0
+        for ag in assessment.age_groups:
+            mask |= AGE_GROUP_BITS[ag]
+
+        with self._lock:
+            columns = self._columns
+            for hwm in assessment.hazards:
+                row = len(self._age_groups)
+                h = hwm.hazard
+                columns["activity"].append(assessment.activity_name)
+                columns["location"].append(assessment.location)
+                columns["hazard"].append(h.description)
+                columns["severity"].append(h.severity.value)
+                columns["likelihood"].append(h.likelihood.value)
+                columns["risk_level"].append(h.risk_level)
+                columns["residual_risk"].append(hwm.residual_risk)
+                columns["who_at_risk"].append(h.who_at_risk)
+                self._age_groups.append(mask)
+
+                for ctrl in hwm.additional_controls:
+                    self._add_control("responsible_person", ctrl.responsible_person, row)
+                    self._add_control("action", ctrl.action, row)
+                    self._control_hazard.append(row)
+
+            self.assessment_count += 1
+
+    def _add_control(self, name: str, value: str, row: int) -> None:
+        """Append a control column value and index it against its hazard row."""
+        code = self._control_columns[name].append(value)
+        postings = self._control_postings[name]
+        if code == len(postings):
+            postings.append(array("i"))
+        # Rows arrive in order, so a repeat for the same hazard is always last
+        if not postings[code] or postings[code][-1] != row:
+            postings[code].append(row)
+
+    def count_by(
+        self,
+        by: Union[str, Sequence[str]],
+        where: Optional[Where] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        """Count hazards grouped by one or more columns.
+
+        Grouping by a control column (responsible_person or action) counts
+        controls instead. An age_group filter also matches assessments for
+        all ages.
+
+        Args:
+            by: Column name, or list of column names, to group by
+            where: Mapping of column name to a value or list of accepted values
+            limit: Maximum number of groups to return
+
+        Returns:
+            Groups as dictionaries with a "count" key, largest first
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        where = where or {}
+        per_control = self._per_control(by, where)
+
+        with self._lock:
+            rows = self._select(where, per_control)
+            codes = [self._codes(name, per_control) for name in by]
+
+            if rows is None:
+                keys = zip(*codes) if len(codes) > 1 else codes[0]
+            elif len(codes) > 1:
+                keys = zip(*([col[i] for i in rows] for col in codes))
+            else:
+                keys = (codes[0][i] for i in rows)
+
+            raw = Counter(keys)
+        if len(codes) == 1:
+            raw = {(code,): count for code, count in raw.items()}
+
+        decoders = [self._decoder(name) for name in by]
+        counts: Counter = Counter()
+        for key, count in raw.items():
+            for values in product(*(decode(code) for decode, code in zip(decoders, key))):
+                counts[values] += count
+
+        ordered = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        if limit is not None:
+            ordered = ordered[:limit]
+        return [dict(zip(by, values), count=count) for values, count in ordered]
+
+    def controls(self, where: Optional[Where] = None, limit: Optional[int] = None) -> list[dict]:
+        """List additional controls with their hazard context.
+
+        Args:
+            where: Mapping of column name to a value or list of accepted values
+            limit: Maximum number of controls to return
+
+        Returns:
+            One dictionary per matching control
+        """
+        where = where or {}
+        self._per_control([], where)
+
+        with self._lock:
+            rows = self._select(where, per_control=True)
+            if rows is None:
+                rows = range(len(self._control_hazard))
+            if limit is not None:
+                rows = rows[:limit]
+
+            hazard_columns = ("activity", "location", "hazard", "residual_risk")
+            results = []
+            for i in rows:
+                row = self._control_hazard[i]
+                record = {
+                    name: self._columns[name].values[self._columns[name].codes[row]]
+                    for name in hazard_columns
+                }
+                for name, column in self._control_columns.items():
+                    record[name] = column.values[column.codes[i]]
+                results.append(record)
+            return results
+
+    def _per_control(self, by: Sequence[str], where: Where) -> bool:
+        """Check whether a count must be made per control rather than per hazard.
+
+        Only grouping by a control column counts controls; filtering on one
+        still counts each matching hazard once.
+        """
+        for name in list(by) + list(where):
+            if name not in COLUMNS:
+                raise ValueError(f"Unknown column: {name}")
+        return any(name in CONTROL_COLUMNS for name in by)
+
+    def _column(self, name: str) -> Column:
+        """Return the encoded column for a hazard or control column name."""
+        if name in CONTROL_COLUMNS:
+            return self._control_columns[name]
+        return self._columns[name]
+
+    def _codes(self, name: str, per_control: bool) -> array:
+        """Return the code array for a column in hazard or control row space."""
+        if name in CONTROL_COLUMNS:
+            return self._control_columns[name].codes
+
+        codes = self._age_groups if name == AGE_GROUP_COLUMN else self._columns[name].codes
+        if not per_control:
+            return codes
+
+        # Hazard codes copied into control row space, extended as rows are added
+        joined = self._joined.setdefault(name, array("i"))
+        if len(joined) < len(self._control_hazard):
+            joined.extend(codes[row] for row in self._control_hazard[len(joined):])
+        return joined
+
+    def _decoder(self, name: str):
+        """Return a function mapping a code to the values it represents."""
+        if name == AGE_GROUP_COLUMN:
+            return lambda mask: [ag.value for ag, bit in AGE_GROUP_BITS.items() if mask & bit]
+
+        column = self._column(name)
+        return lambda code: (column.values[code],)
+
+    def _select(self, where: Where, per_control: bool) -> Optional[list[int]]:
+        """Return matching row indices, or None if every row matches.
+
+        Conditions are evaluated in their own row space. In hazard row space,
+        control conditions keep each hazard with at least one matching
+        control, so a hazard is never counted twice. In control row space,
+        hazard conditions keep controls whose hazard matches.
+        """
+        hazard_where = {k: v for k, v in where.items() if k not in CONTROL_COLUMNS}
+        control_where = {k: v for k, v in where.items() if k in CONTROL_COLUMNS}
+        control_hazard = self._control_hazard
+
+        if per_control:
+            rows = self._filter(control_where, per_control=True)
+            # None means the hazard conditions match every hazard row
+            keep = self._filter(hazard_where, per_control=False) if hazard_where else None
+            if keep is not None:
+                keep = set(keep)
+                if rows is None:
+                    rows = range(len(control_hazard))
+                rows = [i for i in rows if control_hazard[i] in keep]
+            return rows
+
+        rows = None
+        if len(control_where) == 1:
+            # Single control condition: use the per-value hazard row index
+            (name, wanted), = control_where.items()
+            values = [wanted] if isinstance(wanted, str) else list(wanted)
+            postings = self._control_postings[name]
+            codes = self._column(name).codes_for(values)
+            if len(codes) == 1:
+                rows = list(postings[next(iter(codes))])
+            else:
+                rows = sorted(set().union(*(postings[code] for code in codes)))
+        elif control_where:
+            matched = self._filter(control_where, per_control=True)
+            rows = sorted({control_hazard[i] for i in matched})
+
+        return self._filter(hazard_where, per_control=False, rows=rows)
+
+    def _filter(
+        self,
+        where: Where,
+        per_control: bool,
+        rows: Optional[list[int]] = None,
+    ) -> Optional[list[int]]:
+        """Apply conditions on columns native to one row space.
+
+        Args:
+            where: Conditions to apply
+            per_control: Whether rows are control rows rather than hazard rows
+            rows: Candidate rows to narrow, or None to start from every row
+        """
+        for name, wanted in where.items():
+            values = [wanted] if isinstance(wanted, str) else list(wanted)
+            codes = self._codes(name, per_control)
+
+            if name == AGE_GROUP_COLUMN:
+                groups = {AgeGroup(value) for value in values}
+                if AgeGroup.ALL in groups:
+                    continue
+                # Assessments for all ages apply to every age group
+                bits = AGE_GROUP_BITS[AgeGroup.ALL]
+                for ag in groups:
+                    bits |= AGE_GROUP_BITS[ag]
+                if rows is None:
+                    rows = [i for i, mask in enumerate(codes) if mask & bits]
+                else:
+                    rows = [i for i in rows if codes[i] & bits]
+                continue
+
+            allowed = self._column(name).codes_for(values)
+            if len(allowed) == 1:
+                (code,) = allowed
+                if rows is None:
+                    rows = [i for i, c in enumerate(codes) if c == code]
+                else:
+                    rows = [i for i in rows if codes[i] == code]
+            elif rows is None:
+                rows = [i for i, c in enumerate(codes) if c in allowed]
+            else:
+                rows = [i for i in rows if codes[i] in allowed]
+        return rows
+
+
+def load_assessments(paths: Iterable[Union[str, Path]]) -> list[RiskAssessment]:
+    """Load stored assessments from JSON or JSON Lines files.
+
+    A .json file may hold a single assessment or a list of assessments, as
+    produced by RiskAssessment.to_dict. A .jsonl file holds one per line.
+    """
+    assessments = []
+    for path in paths:
+        path = Path(path)
+        text = path.read_text(encoding="utf-8")
+        if path.suffix == ".jsonl":
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+        else:
+            data = json.loads(text)
+            records = data if isinstance(data, list) else [data]
+        assessments.extend(RiskAssessment.from_dict(record) for record in records)
+    return assessments
+
+
+def parse_where(conditions: Iterable[str]) -> Where:
+    """Parse "column=value" strings, collecting repeated columns into lists."""
+    where: dict[str, list[str]] = {}
+    for condition in conditions:
+        name, sep, value = condition.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid filter '{condition}', expected column=value")
+        where.setdefault(name.strip(), []).append(value.strip())
+    return where
+
+
+def main():
+    """Main entry point for the analytics CLI."""
+    parser = argparse.ArgumentParser(
+        description="Query hazards across stored risk assessments"
+    )
+    parser.add_argument(
+        "files",
+        nargs="+",
+        help="Stored assessments (.json or .jsonl)"
+    )
+    parser.add_argument(
+        "-b", "--by",
+        action="append",
+        help=f"Column to group by (repeatable): {', '.join(COLUMNS)}"
+    )
+    parser.add_argument(
+        "-w", "--where",
+        action="append",
+        default=[],
+        help="Filter as column=value (repeatable, e.g. residual_risk=High)"
+    )
+    parser.add_argument(
+        "-n", "--limit",
+        type=int,
+        default=20,
+        help="Maximum number of rows to show (default: 20)"
+    )
+    parser.add_argument(
+        "--controls",
+        action="store_true",
+        help="List matching additional controls instead of counting"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output results as JSON"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        table = HazardTable.from_assessments(load_assessments(args.files))
+        where = parse_where(args.where)
+        if args.controls:
+            results = table.controls(where=where, limit=args.limit)
+        else:
+            results = table.count_by(args.by or ["hazard"], where=where, limit=args.limit)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for record in results:
+        print(" | ".join(str(value) for value in record.values()))
+
+
+if __name__ == "__main__":
+    main()
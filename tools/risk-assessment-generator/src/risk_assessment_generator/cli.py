@@ -3,8 +3,10 @@
 import argparse
 import sys
 
+from .exporters import RENDERERS, export, get_renderer
 from .hazard_identifier import HazardIdentifier
 from .models import AgeGroup
+from .rule_engine import RuleEngine
 
 
 def parse_age_groups(age_str: str) -> list[AgeGroup]:
@@ -40,6 +42,12 @@ def print_risk_assessment(assessment):
     print(f"Assessment Date: {assessment.assessment_date}")
     print(f"Overall Risk Level: {assessment.overall_risk_level}")
 
+    if assessment.is_rule_based:
+        print("\n" + "!" * 60)
+        print("RULE-BASED DRAFT: generated offline from keyword templates,")
+        print("not by Claude. Review carefully before use.")
+        print("!" * 60)
+
     print("\n" + "-" * 60)
     print("IDENTIFIED HAZARDS")
     print("-" * 60)
@@ -95,14 +103,31 @@ def main():
         default="all",
         help="Age groups (comma-separated): baby, toddler, preschool, pre-k, reception, all"
     )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Build a rule-based draft without calling the Claude API"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="Also save the assessment to a file (format from extension)"
+    )
+    parser.add_argument(
+        "-f", "--format",
+        choices=sorted(RENDERERS),
+        help="Output file format (default: taken from --output extension)"
+    )
 
     args = parser.parse_args()
 
-    try:
-        identifier = HazardIdentifier()
-    except ValueError as e:
-        print(f"Error: {e}", file=sys.stderr)
-        sys.exit(1)
+    if args.offline:
+        identifier = RuleEngine()
+    else:
+        try:
+            identifier = HazardIdentifier()
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
 
     age_groups = parse_age_groups(args.ages)
 
@@ -121,6 +146,17 @@ def main():
 
     print_risk_assessment(assessment)
 
+    if args.output:
+        fmt = args.format or args.output.rsplit(".", 1)[-1]
+        try:
+            get_renderer(fmt)
+            with open(args.output, "wb") as f:
+                export(assessment, fmt, f)
+        except (OSError, ValueError) as e:
+            print(f"Error saving assessment: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Saved to {args.output}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,569 @@
+"""Export risk assessments to multiple document formats.
+
+Every renderer consumes the same precomputed ``AssessmentView`` and yields
+its output as a sequence of byte chunks, so documents can be streamed to a
+file or HTTP response without being built in memory first.
+"""
+
+import csv
+import html
+import io
+import json
+from dataclasses import dataclass, field
+from datetime import date
+from typing import BinaryIO, Callable, Iterator, Optional
+
+from docx.shared import RGBColor
+
+from .document_generator import generate_docx, get_risk_color
+from .models import RiskAssessment
+
+FOOTER_TEXT = (
+    "This risk assessment was generated in accordance with the "
+    "Statutory Framework for the Early Years Foundation Stage (EYFS) 2024."
+)
+
+
+@dataclass
+class HazardView:
+    """Display values for a single hazard."""
+    number: int
+    description: str
+    severity: str
+    likelihood: str
+    risk_level: str
+    risk_color: RGBColor
+    who_at_risk: str
+    existing_controls: list[str]
+    additional_controls: list[tuple[str, str]]
+    residual_risk: str
+    residual_color: RGBColor
+
+
+@dataclass
+class AssessmentView:
+    """Display values for a risk assessment, shared by every renderer."""
+    assessment: RiskAssessment
+    activity_name: str
+    activity_description: str
+    location: str
+    age_groups: str
+    assessment_date: date
+    assessor_name: str
+    review_date: Optional[date]
+    overall_risk_level: str
+    overall_color: RGBColor
+    hazards: list[HazardView] = field(default_factory=list)
+    additional_notes: str = ""
+    is_rule_based: bool = False
+
+    @classmethod
+    def from_assessment(cls, assessment: RiskAssessment) -> "AssessmentView":
+        """Precompute risk levels, colours and labels for an assessment."""
+        colors: dict[str, RGBColor] = {}
+
+        def color(level: str) -> RGBColor:
+            if level not in colors:
+                colors[level] = get_risk_color(level)
+            return colors[level]
+
+        hazards = []
+        for i, hwm in enumerate(assessment.hazards, 1):
+            h = hwm.hazard
+            risk_level = h.risk_level
+            hazards.append(HazardView(
+                number=i,
+                description=h.description,
+                severity=h.severity.value,
+                likelihood=h.likelihood.value,
+                risk_level=risk_level,
+                risk_color=color(risk_level),
+                who_at_risk=h.who_at_risk,
+                existing_controls=list(hwm.existing_controls),
+                additional_controls=[
+                    (ctrl.action, ctrl.responsible_person)
+                    for ctrl in hwm.additional_controls
+                ],
+                residual_risk=hwm.residual_risk,
+                residual_color=color(hwm.residual_risk),
+            ))
+
+        overall = assessment.overall_risk_level
+        return cls(
+            assessment=assessment,
+            activity_name=assessment.activity_name,
+            activity_description=assessment.activity_description,
+            location=assessment.location,
+            age_groups=", ".join(ag.value for ag in assessment.age_groups),
+            assessment_date=assessment.assessment_date,
+            assessor_name=assessment.assessor_name,
+            review_date=assessment.review_date,
+            overall_risk_level=overall,
+            overall_color=color(overall),
+            hazards=hazards,
+            additional_notes=assessment.additional_notes,
+            is_rule_based=assessment.is_rule_based,
+        )
+
+    @property
+    def details(self) -> list[tuple[str, str]]:
+        """Activity detail rows as (label, value) pairs."""
+        return [
+            ("Activity Name", self.activity_name),
+            ("Description", self.activity_description),
+            ("Location", self.location),
+            ("Age Groups", self.age_groups),
+            ("Assessment Date", self.assessment_date.strftime("%d %B %Y")),
+            ("Assessed By", self.assessor_name or "Not specified"),
+        ]
+
+    @property
+    def review_date_text(self) -> str:
+        """Review date for display."""
+        if self.review_date:
+            return self.review_date.strftime("%d %B %Y")
+        return "To be determined"
+
+
+@dataclass(frozen=True)
+class Renderer:
+    """A registered output format."""
+    name: str
+    extension: str
+    mimetype: str
+    render: Callable[[AssessmentView], Iterator[bytes]]
+
+    def filename(self, assessment: RiskAssessment) -> str:
+        """Build a download filename for an assessment."""
+        slug = assessment.activity_name.lower().replace(" ", "_")
+        return f"risk_assessment_{slug}.{self.extension}"
+
+
+RENDERERS: dict[str, Renderer] = {}
+
+
+def register_renderer(name: str, extension: str, mimetype: str):
+    """Register a function yielding byte chunks as an output format."""
+    def decorator(func: Callable[[AssessmentView], Iterator[bytes]]):
+        RENDERERS[name] = Renderer(name, extension, mimetype, func)
+        return func
+    return decorator
+
+
+def get_renderer(name: str) -> Renderer:
+    """Look up a renderer by format name."""
+    try:
+        return RENDERERS[name.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown format '{name}'. Available formats: {', '.join(RENDERERS)}"
+        ) from None
+
+
+def render(assessment: RiskAssessment, fmt: str) -> Iterator[bytes]:
+    """Render an assessment in the given format as a stream of byte chunks."""
+    renderer = get_renderer(fmt)
+    return renderer.render(AssessmentView.from_assessment(assessment))
+
+
+def export(assessment: RiskAssessment, fmt: str, stream: BinaryIO) -> None:
+    """Write an assessment in the given format to a binary stream."""
+    for chunk in render(assessment, fmt):
+        stream.write(chunk)
+
+
+@register_renderer(
+    "docx",
+    "docx",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+)
+def render_docx(view: AssessmentView) -> Iterator[bytes]:
+    """Render as a Word document using generate_docx."""
+    buffer = generate_docx(view.assessment)
+    while True:
+        chunk = buffer.read(64 * 1024)
+        if not chunk:
+            break
+        yield chunk
+
+
+@register_renderer("json", "json", "application/json")
+def render_json(view: AssessmentView) -> Iterator[bytes]:
+    """Render as JSON, in the same shape as RiskAssessment.to_dict."""
+    header = {
+        "activity_name": view.activity_name,
+        "activity_description": view.activity_description,
+        "location": view.location,
+        "age_groups": [ag.value for ag in view.assessment.age_groups],
+        "assessment_date": view.assessment_date.isoformat(),
+        "assessor_name": view.assessor_name,
+        "review_date": view.review_date.isoformat() if view.review_date else None,
+        "overall_risk_level": view.overall_risk_level,
+    }
+    yield json.dumps(header)[:-1].encode("utf-8") + b', "hazards": ['
+
+    for hv in view.hazards:
+        hazard = {
+            "description": hv.description,
+            "severity": hv.severity,
+            "likelihood": hv.likelihood,
+            "risk_level": hv.risk_level,
+            "who_at_risk": hv.who_at_risk,
+            "existing_controls": hv.existing_controls,
+            "additional_controls": [
+                {"action": action, "responsible_person": person}
+                for action, person in hv.additional_controls
+            ],
+            "residual_risk": hv.residual_risk,
+        }
+        prefix = b"" if hv.number == 1 else b", "
+        yield prefix + json.dumps(hazard).encode("utf-8")
+
+    yield (
+        b'], "additional_notes": ' + json.dumps(view.additional_notes).encode("utf-8")
+        + b', "is_rule_based": ' + json.dumps(view.is_rule_based).encode("utf-8") + b"}"
+    )
+
+
+CSV_HEADER = [
+    "Activity",
+    "Location",
+    "Age Groups",
+    "Assessment Date",
+    "Hazard No",
+    "Hazard",
+    "Severity",
+    "Likelihood",
+    "Risk Level",
+    "Who at Risk",
+    "Existing Controls",
+    "Additional Controls",
+    "Residual Risk",
+]
+
+
+@register_renderer("csv", "csv", "text/csv")
+def render_csv(view: AssessmentView) -> Iterator[bytes]:
+    """Render as CSV with one row per hazard."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writerow(CSV_HEADER)
+    yield b"\xef\xbb\xbf" + flush()  # BOM so Excel detects UTF-8
+
+    assessment_date = view.assessment_date.isoformat()
+    for hv in view.hazards:
+        writer.writerow([
+            view.activity_name,
+            view.location,
+            view.age_groups,
+            assessment_date,
+            hv.number,
+            hv.description,
+            hv.severity,
+            hv.likelihood,
+            hv.risk_level,
+            hv.who_at_risk,
+            "; ".join(hv.existing_controls),
+            "; ".join(f"{action} ({person})" for action, person in hv.additional_controls),
+            hv.residual_risk,
+        ])
+        yield flush()
+
+
+HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>Risk Assessment: {title}</title>
+<style>
+body {{ font-family: Arial, Helvetica, sans-serif; max-width: 900px; margin: 0 auto; padding: 20px; color: #333; }}
+h1, h2 {{ color: #2c5aa0; }}
+table {{ border-collapse: collapse; width: 100%; }}
+td {{ border: 1px solid #ccc; padding: 6px 10px; vertical-align: top; }}
+td.label {{ font-weight: bold; width: 180px; }}
+.hazard {{ border: 1px solid #e0e0e0; border-radius: 6px; padding: 10px 15px; margin-bottom: 15px; }}
+.meta {{ color: #666; }}
+footer {{ font-size: 0.9em; color: #666; margin-top: 30px; }}
+</style>
+</head>
+<body>
+"""
+
+
+@register_renderer("html", "html", "text/html")
+def render_html(view: AssessmentView) -> Iterator[bytes]:
+    """Render as a standalone static HTML page."""
+    esc = html.escape
+
+    def level(text: str, color: RGBColor) -> str:
+        return f'<strong style="color: #{color}">{esc(text)}</strong>'
+
+    parts = [
+        HTML_HEAD.format(title=esc(view.activity_name)),
+        f"<h1>Risk Assessment</h1>\n<h2>{esc(view.activity_name)}</h2>\n",
+        "<h2>Activity Details</h2>\n<table>\n",
+    ]
+    for label, value in view.details:
+        parts.append(f'<tr><td class="label">{esc(label)}</td><td>{esc(value)}</td></tr>\n')
+    parts.append("</table>\n")
+    parts.append(
+        f"<p><strong>Overall Risk Level:</strong> "
+        f"{level(view.overall_risk_level, view.overall_color)}</p>\n"
+        "<h2>Identified Hazards &amp; Control Measures</h2>\n"
+    )
+    yield "".join(parts).encode("utf-8")
+
+    for hv in view.hazards:
+        parts = [
+            f'<div class="hazard" style="border-left: 4px solid #{hv.risk_color}">\n',
+            f"<p><strong>{hv.number}. {esc(hv.description)}</strong></p>\n",
+            f'<p class="meta"><strong>Severity:</strong> {esc(hv.severity)} | '
+            f"<strong>Likelihood:</strong> {esc(hv.likelihood)} | "
+            f"<strong>Risk Level:</strong> {level(hv.risk_level, hv.risk_color)}</p>\n",
+            f"<p><strong>Who is at risk:</strong> {esc(hv.who_at_risk)}</p>\n",
+        ]
+        if hv.existing_controls:
+            parts.append("<p><strong>Existing Controls:</strong></p>\n<ul>\n")
+            parts.extend(f"<li>{esc(control)}</li>\n" for control in hv.existing_controls)
+            parts.append("</ul>\n")
+        if hv.additional_controls:
+            parts.append("<p><strong>Additional Controls Required:</strong></p>\n<ul>\n")
+            parts.extend(
+                f"<li>{esc(action)} <em>({esc(person)})</em></li>\n"
+                for action, person in hv.additional_controls
+            )
+            parts.append("</ul>\n")
+        parts.append(
+            f"<p><strong>Residual Risk:</strong> {level(hv.residual_risk, hv.residual_color)}</p>\n"
+            "</div>\n"
+        )
+        yield "".join(parts).encode("utf-8")
+
+    parts = []
+    if view.additional_notes:
+        parts.append(f"<h2>Additional Notes</h2>\n<p>{esc(view.additional_notes)}</p>\n")
+    parts.append(
+        f"<footer>{esc(FOOTER_TEXT)} Review date: {esc(view.review_date_text)}</footer>\n"
+        "</body>\n</html>\n"
+    )
+    yield "".join(parts).encode("utf-8")
+
+
+# Helvetica glyph widths (1/1000 em) for ASCII 32-126, from the standard AFM
+HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+
+PAGE_WIDTH = 595  # A4 in points
+PAGE_HEIGHT = 842
+PAGE_MARGIN = 50
+BLACK = RGBColor(0, 0, 0)
+
+
+def _text_width(text: str, size: float, bold: bool = False) -> float:
+    """Approximate the rendered width of text in Helvetica."""
+    units = sum(
+        HELVETICA_WIDTHS[ord(c) - 32] if 32 <= ord(c) < 127 else 556
+        for c in text
+    )
+    # Helvetica-Bold is roughly 5% wider than the regular face
+    return units * size / 1000 * (1.05 if bold else 1.0)
+
+
+def _wrap(text: str, width: float, size: float, bold: bool = False) -> list[str]:
+    """Wrap text into lines no wider than width points."""
+    lines = []
+    current = ""
+    for word in text.split():
+        candidate = f"{current} {word}" if current else word
+        if current and _text_width(candidate, size, bold) > width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    lines.append(current)
+    return lines
+
+
+def _pdf_string(text: str) -> bytes:
+    """Encode text as a PDF literal string."""
+    data = text.encode("cp1252", errors="replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+class _PdfLayout:
+    """Lays out text lines into PDF page content streams."""
+
+    def __init__(self):
+        self.pages: list[bytes] = []
+        self._ops: list[bytes] = []
+        self._y = PAGE_HEIGHT - PAGE_MARGIN
+
+    def text(
+        self,
+        text: str,
+        size: float = 11,
+        bold: bool = False,
+        color: RGBColor = BLACK,
+        indent: float = 0,
+        space_before: float = 0,
+        prefix: str = "",
+    ) -> None:
+        """Add a wrapped paragraph."""
+        self._y -= space_before
+        x = PAGE_MARGIN + indent
+        width = PAGE_WIDTH - PAGE_MARGIN - x
+        leading = size * 1.3
+        font = b"/F2" if bold else b"/F1"
+        rgb = b"%.3f %.3f %.3f rg" % tuple(c / 255 for c in color)
+
+        for i, line in enumerate(_wrap(text, width, size, bold)):
+            if self._y - leading < PAGE_MARGIN:
+                self.break_page()
+            self._y -= leading
+            line = (prefix if i == 0 else " " * len(prefix)) + line
+            self._ops.append(
+                b"BT %s %g Tf %s %g %g Td %s Tj ET"
+                % (font, size, rgb, x, self._y, _pdf_string(line))
+            )
+
+    def break_page(self) -> None:
+        """Finish the current page and start a new one."""
+        self.pages.append(b"\n".join(self._ops))
+        self._ops = []
+        self._y = PAGE_HEIGHT - PAGE_MARGIN
+
+    def take_pages(self) -> list[bytes]:
+        """Return and clear the completed pages."""
+        pages, self.pages = self.pages, []
+        return pages
+
+    def finish(self) -> list[bytes]:
+        """Finish the last page and return every remaining page."""
+        if self._ops:
+            self.break_page()
+        return self.take_pages()
+
+
+class _PdfWriter:
+    """Serialises PDF objects while tracking their byte offsets."""
+
+    PAGES_ID = 2
+
+    def __init__(self):
+        self.offsets: dict[int, int] = {}
+        self.position = 0
+        self.page_ids: list[int] = []
+        self._next_id = 5
+
+    def emit(self, data: bytes) -> bytes:
+        self.position += len(data)
+        return data
+
+    def obj(self, obj_id: int, body: bytes) -> bytes:
+        self.offsets[obj_id] = self.position
+        return self.emit(b"%d 0 obj\n%s\nendobj\n" % (obj_id, body))
+
+    def header(self) -> bytes:
+        return (
+            self.emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+            + self.obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+            + self.obj(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+                          b"/Encoding /WinAnsiEncoding >>")
+            + self.obj(4, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold "
+                          b"/Encoding /WinAnsiEncoding >>")
+        )
+
+    def page(self, content: bytes) -> bytes:
+        content_id, page_id = self._next_id, self._next_id + 1
+        self._next_id += 2
+        self.page_ids.append(page_id)
+        return self.obj(
+            content_id,
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content),
+        ) + self.obj(
+            page_id,
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+            % (PAGE_WIDTH, PAGE_HEIGHT, content_id),
+        )
+
+    def trailer(self) -> bytes:
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in self.page_ids)
+        data = self.obj(
+            self.PAGES_ID,
+            b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.page_ids)),
+        )
+        xref_offset = self.position
+        size = self._next_id
+        xref = [b"xref\n0 %d\n0000000000 65535 f \n" % size]
+        for obj_id in range(1, size):
+            xref.append(b"%010d 00000 n \n" % self.offsets[obj_id])
+        xref.append(
+            b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (size, xref_offset)
+        )
+        return data + b"".join(xref)
+
+
+@register_renderer("pdf", "pdf", "application/pdf")
+def render_pdf(view: AssessmentView) -> Iterator[bytes]:
+    """Render as a PDF, emitting each page as soon as it is laid out."""
+    writer = _PdfWriter()
+    layout = _PdfLayout()
+    yield writer.header()
+
+    layout.text("Risk Assessment", size=22, bold=True)
+    layout.text(view.activity_name, size=16, bold=True, space_before=6)
+    layout.text("Activity Details", size=15, bold=True, color=RGBColor(44, 90, 160), space_before=14)
+    for label, value in view.details:
+        layout.text(f"{label}: {value}", space_before=2)
+    layout.text(
+        f"Overall Risk Level: {view.overall_risk_level}",
+        bold=True, color=view.overall_color, space_before=10,
+    )
+    layout.text(
+        "Identified Hazards & Control Measures",
+        size=15, bold=True, color=RGBColor(44, 90, 160), space_before=14,
+    )
+
+    for hv in view.hazards:
+        layout.text(f"{hv.number}. {hv.description}", bold=True, space_before=10)
+        layout.text(f"Severity: {hv.severity}  |  Likelihood: {hv.likelihood}", space_before=2)
+        layout.text(f"Risk Level: {hv.risk_level}", bold=True, color=hv.risk_color)
+        layout.text(f"Who is at risk: {hv.who_at_risk}")
+        if hv.existing_controls:
+            layout.text("Existing Controls:", bold=True, space_before=4)
+            for control in hv.existing_controls:
+                layout.text(control, indent=12, prefix="• ")
+        if hv.additional_controls:
+            layout.text("Additional Controls Required:", bold=True, space_before=4)
+            for action, person in hv.additional_controls:
+                layout.text(f"{action} ({person})", indent=12, prefix="• ")
+        layout.text(
+            f"Residual Risk: {hv.residual_risk}",
+            bold=True, color=hv.residual_color, space_before=4,
+        )
+        for content in layout.take_pages():
+            yield writer.page(content)
+
+    if view.additional_notes:
+        layout.text("Additional Notes", size=15, bold=True, color=RGBColor(44, 90, 160), space_before=14)
+        layout.text(view.additional_notes)
+    layout.text(f"{FOOTER_TEXT} Review date: {view.review_date_text}", size=9, space_before=20)
+
+    for content in layout.finish():
+        yield writer.page(content)
+    yield writer.trailer()
@@ -2,7 +2,8 @@
 
 import json
 import os
-from typing import Optional
+import time
+from typing import Callable, Optional
 
 import anthropic
 
@@ -15,6 +16,28 @@ from .models import (
     RiskAssessment,
     Severity,
 )
+from .model_router import ModelRouter, ModelTier
+from .rule_engine import RuleEngine
+
+# Fewer hazards than this suggests a low-confidence answer worth escalating
+MIN_HAZARDS = 3
+
+RISK_LEVELS = ("Low", "Medium", "High")
+
+# Errors meaning the API is temporarily unavailable, as opposed to a bad key,
+# model or request. Only these fall back to the rule engine. Newer SDK
+# versions add specific 5xx subclasses; older ones raise InternalServerError.
+TRANSIENT_API_ERRORS = tuple(
+    getattr(anthropic, name)
+    for name in (
+        "APIConnectionError",  # includes APITimeoutError
+        "InternalServerError",
+        "RateLimitError",
+        "OverloadedError",
+        "ServiceUnavailableError",
+    )
+    if hasattr(anthropic, name)
+)
 
 SYSTEM_PROMPT = """You are an expert in early years childcare health and safety in the UK, with comprehensive knowledge of the Statutory Framework for the Early Years Foundation Stage (EYFS) 2024.
 
@@ -85,16 +108,77 @@ Requirements:
 - Ensure controls are proportionate - don't over-complicate low-risk activities
 - Reference specific EYFS requirements where relevant (e.g., ratio requirements, first aid)"""
 
+HAZARD_DELTA_PROMPT = """An existing EYFS 2024 risk assessment needs updating because the activity details have changed. Do not regenerate the assessment - only report the hazards that must change.
+
+Previous details:
+{previous_details}
+
+Updated details:
+{updated_details}
+
+Existing hazards (index: description | severity | likelihood | residual risk, followed by current controls):
+{existing_hazards}
+
+Respond in JSON format with the following structure, omitting anything that is unchanged:
+{{
+    "removed": [0],
+    "modified": [
+        {{
+            "index": 1,
+            "description": "Only include the fields that change",
+            "severity": "Low" | "Medium" | "High",
+            "likelihood": "Unlikely" | "Possible" | "Likely",
+            "who_at_risk": "...",
+            "existing_controls": ["Complete replacement for the current list"],
+            "additional_controls": [{{"action": "Complete replacement for the current list", "responsible_person": "..."}}],
+            "residual_risk": "Low" | "Medium" | "High"
+        }}
+    ],
+    "added": [
+        {{
+            "description": "Clear description of the hazard",
+            "severity": "Low" | "Medium" | "High",
+            "likelihood": "Unlikely" | "Possible" | "Likely",
+            "who_at_risk": "Who could be harmed (e.g., Children, Staff, Both)",
+            "existing_controls": ["Control measures typically already in place"],
+            "additional_controls": [
+                {{
+                    "action": "Specific action to take",
+                    "responsible_person": "Who should do this (e.g., Room Leader, All Staff, Manager)"
+                }}
+            ],
+            "residual_risk": "Low" | "Medium" | "High"
+        }}
+    ],
+    "additional_notes": "Only include if the notes need rewriting"
+}}
+
+Requirements:
+- Refer to existing hazards by index only
+- When changing a hazard's controls, start from its current controls listed above and return the complete new list
+- Keep the change set as small as possible; return empty lists if nothing needs to change
+- Consider age-specific risks and EYFS staff:child ratios for any newly added age groups"""
+
 
 class HazardIdentifier:
     """Identifies hazards for nursery activities using Claude API."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        use_fallback: bool = True,
+        router: Optional[ModelRouter] = None,
+    ):
         """Initialize with Anthropic API key.
 
         Args:
             api_key: Anthropic API key. If not provided, reads from
                     ANTHROPIC_API_KEY environment variable.
+            use_fallback: If True, build a rule-based draft assessment when
+                    the Claude API is unreachable, overloaded or rate limited.
+            router: Model router to choose tiers and record call statistics.
+                    Pass a shared instance to aggregate statistics across
+                    identifiers.
         """
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         if not self.api_key:
@@ -103,6 +187,8 @@ class HazardIdentifier:
                 "variable or pass api_key parameter."
             )
         self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.fallback_engine = RuleEngine() if use_fallback else None
+        self.router = router or ModelRouter(rule_engine=self.fallback_engine)
 
     def identify_hazards(
         self,
@@ -134,40 +220,34 @@ class HazardIdentifier:
             age_groups=age_groups_str,
         )
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2000,
-            system=SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": prompt}],
-        )
-
-        response_text = response.content[0].text
-        assessment_data = self._parse_response(response_text)
+        decision = self.router.route(activity_name, activity_description, location, age_groups)
 
-        hazards_with_mitigation = []
-        for hazard_data in assessment_data.get("hazards", []):
-            hazard = Hazard(
-                description=hazard_data["description"],
-                severity=Severity(hazard_data["severity"]),
-                likelihood=Likelihood(hazard_data["likelihood"]),
-                who_at_risk=hazard_data["who_at_risk"],
+        try:
+            assessment_data = self._complete(
+                prompt,
+                decision.tier_index,
+                2000,
+                self._validate_hazards,
+                incomplete=self._too_few_hazards,
             )
-
-            additional_controls = [
-                MitigationStrategy(
-                    action=ctrl["action"],
-                    responsible_person=ctrl.get("responsible_person", "Nursery Staff"),
+        except TRANSIENT_API_ERRORS as error:
+            if self.fallback_engine is None:
+                raise
+            try:
+                return self.fallback_engine.identify_hazards(
+                    activity_name=activity_name,
+                    activity_description=activity_description,
+                    location=location,
+                    age_groups=age_groups,
                 )
-                for ctrl in hazard_data.get("additional_controls", [])
-            ]
-
-            hazard_with_mitigation = HazardWithMitigation(
-                hazard=hazard,
-                existing_controls=hazard_data.get("existing_controls", []),
-                additional_controls=additional_controls,
-                residual_risk=hazard_data.get("residual_risk", "Low"),
-            )
-            hazards_with_mitigation.append(hazard_with_mitigation)
+            except ValueError:
+                # No template matches, so report the outage rather than an empty draft
+                raise error from None
+
+        hazards_with_mitigation = [
+            self._build_hazard(hazard_data)
+            for hazard_data in assessment_data.get("hazards", [])
+        ]
 
         return RiskAssessment(
             activity_name=activity_name,
@@ -178,6 +258,360 @@ class HazardIdentifier:
             additional_notes=assessment_data.get("additional_notes", ""),
         )
 
+    def update_assessment(
+        self,
+        assessment: RiskAssessment,
+        activity_name: Optional[str] = None,
+        activity_description: Optional[str] = None,
+        location: Optional[str] = None,
+        age_groups: Optional[list[AgeGroup]] = None,
+    ) -> RiskAssessment:
+        """Incrementally update an existing assessment after its inputs change.
+
+        Rather than regenerating every hazard, Claude is sent the previous and
+        updated details alongside a compact summary of the existing hazards,
+        and asked only for hazards to add, remove or modify. The patch is
+        applied to the existing model objects in place.
+
+        Args:
+            assessment: The assessment to update
+            activity_name: New activity name, if changed
+            activity_description: New activity description, if changed
+            location: New location, if changed
+            age_groups: New list of age groups, if changed
+
+        Returns:
+            The same RiskAssessment instance, patched
+        """
+        previous = {
+            "Activity": assessment.activity_name,
+            "Description": assessment.activity_description,
+            "Location": assessment.location,
+            "Age Groups": ", ".join(ag.value for ag in assessment.age_groups),
+        }
+        updated = dict(previous)
+        if activity_name is not None:
+            updated["Activity"] = activity_name
+        if activity_description is not None:
+            updated["Description"] = activity_description
+        if location is not None:
+            updated["Location"] = location
+        if age_groups is not None:
+            updated["Age Groups"] = ", ".join(ag.value for ag in age_groups)
+
+        if updated == previous:
+            return assessment
+
+        existing_hazards = "\n".join(
+            self._summarise_hazard(i, hwm) for i, hwm in enumerate(assessment.hazards)
+        ) or "(none)"
+
+        prompt = HAZARD_DELTA_PROMPT.format(
+            previous_details=self._format_details(previous),
+            updated_details=self._format_details(updated),
+            existing_hazards=existing_hazards,
+        )
+
+        decision = self.router.route(
+            updated["Activity"],
+            updated["Description"],
+            updated["Location"],
+            age_groups if age_groups is not None else assessment.age_groups,
+        )
+        # _complete only returns a delta that passed validation, so the
+        # assessment is never left half-updated by a bad patch
+        hazard_count = len(assessment.hazards)
+        delta = self._complete(
+            prompt,
+            decision.tier_index,
+            1000,
+            lambda data: self._validate_delta(data, hazard_count),
+        )
+
+        if activity_name is not None:
+            assessment.activity_name = activity_name
+        if activity_description is not None:
+            assessment.activity_description = activity_description
+        if location is not None:
+            assessment.location = location
+        if age_groups is not None:
+            assessment.age_groups = age_groups
+
+        self._apply_delta(assessment, delta)
+        return assessment
+
+    def _complete(
+        self,
+        prompt: str,
+        tier_index: int,
+        max_tokens: int,
+        validate: Callable[[dict], Optional[str]],
+        incomplete: Optional[Callable[[dict], Optional[str]]] = None,
+    ) -> dict:
+        """Send a prompt, escalating to larger models until output is usable.
+
+        Args:
+            prompt: User prompt to send
+            tier_index: Index of the router tier to start with
+            max_tokens: Maximum tokens for the response
+            validate: Returns a reason the parsed output is unusable, or None
+            incomplete: Returns a reason valid output is worth retrying on a
+                    larger model, or None
+
+        Returns:
+            Parsed JSON from the first model whose output passes both checks,
+            otherwise the last valid output received
+
+        Raises:
+            ValueError: If no model produced valid output
+        """
+        calls: list[tuple[ModelTier, int, int]] = []
+        start = time.perf_counter()
+        failed = True
+        try:
+            data = self._escalate(prompt, tier_index, max_tokens, validate, incomplete, calls)
+            failed = False
+            return data
+        finally:
+            self.router.record_request(
+                self.router.tiers[tier_index],
+                time.perf_counter() - start,
+                calls,
+                failed=failed,
+            )
+
+    def _escalate(
+        self,
+        prompt: str,
+        tier_index: int,
+        max_tokens: int,
+        validate: Callable[[dict], Optional[str]],
+        incomplete: Optional[Callable[[dict], Optional[str]]],
+        calls: list[tuple[ModelTier, int, int]],
+    ) -> dict:
+        """Call each tier from tier_index upwards; see _complete.
+
+        Each call made is appended to calls as (tier, input_tokens, output_tokens).
+        """
+        tiers = self.router.tiers
+        problem = None
+        best = None
+
+        for index in range(tier_index, len(tiers)):
+            tier = tiers[index]
+            last = index == len(tiers) - 1
+            start = time.perf_counter()
+            try:
+                response = self.client.messages.create(
+                    model=tier.model,
+                    max_tokens=max_tokens,
+                    system=SYSTEM_PROMPT,
+                    messages=[{"role": "user", "content": prompt}],
+                )
+            except anthropic.APIError:
+                calls.append((tier, 0, 0))
+                self.router.record(tier, time.perf_counter() - start, failed=True)
+                # An escalation call failing should not discard a usable answer
+                if best is None:
+                    raise
+                return best
+            latency = time.perf_counter() - start
+            usage = response.usage
+            calls.append((tier, usage.input_tokens, usage.output_tokens))
+
+            data = None
+            weak = None
+            if response.stop_reason == "max_tokens":
+                problem = "response truncated"
+            else:
+                try:
+                    data = self._parse_response(response.content[0].text)
+                except ValueError as e:
+                    problem = f"invalid JSON ({e})"
+                else:
+                    problem = validate(data)
+                    if problem is None:
+                        best = data
+                        weak = incomplete(data) if incomplete else None
+
+            self.router.record(
+                tier,
+                latency,
+                input_tokens=usage.input_tokens,
+                output_tokens=usage.output_tokens,
+                failed=problem is not None,
+                escalated=(problem is not None or weak is not None) and not last,
+            )
+            if problem is None and weak is None:
+                return data
+
+        if best is not None:
+            return best
+        raise ValueError(f"Model output failed validation: {problem}")
+
+    def _validate_hazards(self, data: dict) -> Optional[str]:
+        """Check a full assessment response; returns a problem or None."""
+        if not isinstance(data, dict) or not isinstance(data.get("hazards"), list):
+            return "missing hazards list"
+
+        for hazard_data in data["hazards"]:
+            problem = self._check_hazard(hazard_data)
+            if problem:
+                return problem
+        return None
+
+    def _too_few_hazards(self, data: dict) -> Optional[str]:
+        """Flag a valid assessment that looks incomplete; returns a reason or None."""
+        if len(data["hazards"]) < MIN_HAZARDS:
+            return f"only {len(data['hazards'])} hazards identified"
+        return None
+
+    def _validate_delta(self, data: dict, hazard_count: int) -> Optional[str]:
+        """Check a delta against an assessment with hazard_count hazards.
+
+        Returns a problem or None.
+        """
+        if not isinstance(data, dict):
+            return "delta is not an object"
+
+        for key in ("removed", "modified", "added"):
+            if not isinstance(data.get(key, []), list):
+                return f"'{key}' is not a list"
+
+        def valid_index(index) -> bool:
+            return type(index) is int and 0 <= index < hazard_count
+
+        for index in data.get("removed", []):
+            if not valid_index(index):
+                return f"invalid removed index {index!r}"
+
+        for change in data.get("modified", []):
+            if not isinstance(change, dict) or not valid_index(change.get("index")):
+                return f"modified hazard has invalid index {change!r}"
+            problem = self._check_hazard(change, partial=True)
+            if problem:
+                return problem
+
+        for hazard_data in data.get("added", []):
+            problem = self._check_hazard(hazard_data)
+            if problem:
+                return problem
+        return None
+
+    def _check_hazard(self, hazard_data: dict, partial: bool = False) -> Optional[str]:
+        """Check a hazard JSON object; partial objects may omit fields."""
+        if not isinstance(hazard_data, dict):
+            return "hazard is not an object"
+
+        required = ("description", "severity", "likelihood", "who_at_risk")
+        if not partial and any(not hazard_data.get(key) for key in required):
+            return "hazard missing required fields"
+
+        if "severity" in hazard_data and hazard_data["severity"] not in {sv.value for sv in Severity}:
+            return f"invalid severity '{hazard_data['severity']}'"
+        if "likelihood" in hazard_data and hazard_data["likelihood"] not in {lv.value for lv in Likelihood}:
+            return f"invalid likelihood '{hazard_data['likelihood']}'"
+        if "residual_risk" in hazard_data and hazard_data["residual_risk"] not in RISK_LEVELS:
+            return f"invalid residual risk '{hazard_data['residual_risk']}'"
+
+        existing_controls = hazard_data.get("existing_controls", [])
+        if not isinstance(existing_controls, list) or not all(
+            isinstance(ctrl, str) for ctrl in existing_controls
+        ):
+            return "existing controls must be a list of strings"
+
+        additional_controls = hazard_data.get("additional_controls", [])
+        if not isinstance(additional_controls, list):
+            return "additional controls must be a list"
+        for ctrl in additional_controls:
+            if not isinstance(ctrl, dict) or not ctrl.get("action"):
+                return "control missing action"
+        return None
+
+    def _build_hazard(self, hazard_data: dict) -> HazardWithMitigation:
+        """Build a HazardWithMitigation from a hazard JSON object."""
+        hazard = Hazard(
+            description=hazard_data["description"],
+            severity=Severity(hazard_data["severity"]),
+            likelihood=Likelihood(hazard_data["likelihood"]),
+            who_at_risk=hazard_data["who_at_risk"],
+        )
+
+        return HazardWithMitigation(
+            hazard=hazard,
+            existing_controls=hazard_data.get("existing_controls", []),
+            additional_controls=self._build_controls(
+                hazard_data.get("additional_controls", [])
+            ),
+            residual_risk=hazard_data.get("residual_risk", "Low"),
+        )
+
+    def _build_controls(self, controls_data: list[dict]) -> list[MitigationStrategy]:
+        """Build MitigationStrategy objects from control JSON objects."""
+        return [
+            MitigationStrategy(
+                action=ctrl["action"],
+                responsible_person=ctrl.get("responsible_person", "Nursery Staff"),
+            )
+            for ctrl in controls_data
+        ]
+
+    def _apply_delta(self, assessment: RiskAssessment, delta: dict) -> None:
+        """Apply an added/removed/modified hazard patch to an assessment.
+
+        The delta must already have passed _validate_delta. Indices refer to
+        the hazard list as it was sent, so modifications are applied before
+        removals and additions.
+        """
+        hazards = assessment.hazards
+
+        for change in delta.get("modified", []):
+            hwm = hazards[change["index"]]
+            if "description" in change:
+                hwm.hazard.description = change["description"]
+            if "severity" in change:
+                hwm.hazard.severity = Severity(change["severity"])
+            if "likelihood" in change:
+                hwm.hazard.likelihood = Likelihood(change["likelihood"])
+            if "who_at_risk" in change:
+                hwm.hazard.who_at_risk = change["who_at_risk"]
+            if "existing_controls" in change:
+                hwm.existing_controls = change["existing_controls"]
+            if "additional_controls" in change:
+                hwm.additional_controls = self._build_controls(change["additional_controls"])
+            if "residual_risk" in change:
+                hwm.residual_risk = change["residual_risk"]
+
+        removed = set(delta.get("removed", []))
+        if removed:
+            hazards[:] = [hwm for i, hwm in enumerate(hazards) if i not in removed]
+
+        for hazard_data in delta.get("added", []):
+            hazards.append(self._build_hazard(hazard_data))
+
+        if delta.get("additional_notes"):
+            assessment.additional_notes = delta["additional_notes"]
+
+    def _summarise_hazard(self, index: int, hwm: HazardWithMitigation) -> str:
+        """Summarise a hazard and its current controls for the delta prompt."""
+        h = hwm.hazard
+        lines = [
+            f"{index}: {h.description} | {h.severity.value} | "
+            f"{h.likelihood.value} | {hwm.residual_risk}"
+        ]
+        if hwm.existing_controls:
+            lines.append("   Existing controls: " + "; ".join(hwm.existing_controls))
+        if hwm.additional_controls:
+            lines.append("   Additional controls: " + "; ".join(
+                f"{ctrl.action} ({ctrl.responsible_person})"
+                for ctrl in hwm.additional_controls
+            ))
+        return "\n".join(lines)
+
+    def _format_details(self, details: dict) -> str:
+        """Format activity details as prompt lines."""
+        return "\n".join(f"{label}: {value}" for label, value in details.items())
+
     def _parse_response(self, response_text: str) -> dict:
         """Parse JSON from Claude's response.
 
@@ -0,0 +1,271 @@
+"""Cost and latency aware model selection for hazard identification.
+
+Simple activities are routed to a small, fast model; long descriptions,
+many age groups, outings and detailed activities the rule engine does not
+recognise start on a larger one, while activities it knows well stay small.
+Callers escalate to the next tier when a model's output fails validation or
+looks incomplete, and every call is recorded for latency and token
+statistics.
+
+Each tier's model ID can be overridden with an environment variable named
+RISK_ASSESSMENT_<TIER>_MODEL, e.g. RISK_ASSESSMENT_SMALL_MODEL.
+"""
+
+import os
+import statistics
+import threading
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Iterable, Mapping, Optional
+
+from .models import AgeGroup
+from .rule_engine import RuleEngine
+
+
+@dataclass(frozen=True)
+class ModelTier:
+    """A Claude model and its price per million tokens (USD)."""
+    name: str
+    model: str
+    input_cost: float
+    output_cost: float
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        """Return the price in USD of a call with the given token counts."""
+        return (input_tokens * self.input_cost + output_tokens * self.output_cost) / 1_000_000
+
+
+MODEL_TIERS: tuple[ModelTier, ...] = (
+    ModelTier("small", "claude-3-5-haiku-20241022", input_cost=0.80, output_cost=4.0),
+    ModelTier("medium", "claude-sonnet-4-20250514", input_cost=3.0, output_cost=15.0),
+    ModelTier("large", "claude-opus-4-20250514", input_cost=15.0, output_cost=75.0),
+)
+
+
+def configured_tiers(
+    tiers: tuple[ModelTier, ...] = MODEL_TIERS,
+    environ: Optional[Mapping[str, str]] = None,
+) -> tuple[ModelTier, ...]:
+    """Return tiers with model IDs overridden from the environment.
+
+    Prices are kept, so an override should be a model of similar cost.
+
+    Args:
+        tiers: Default tiers
+        environ: Environment to read. Defaults to os.environ.
+    """
+    if environ is None:
+        environ = os.environ
+    return tuple(
+        replace(tier, model=environ.get(f"RISK_ASSESSMENT_{tier.name.upper()}_MODEL") or tier.model)
+        for tier in tiers
+    )
+
+
+@dataclass
+class RouteDecision:
+    """The tier chosen for a request and why."""
+    tier_index: int
+    score: int
+    confidence: float
+    reasons: list[str] = field(default_factory=list)
+
+
+@dataclass
+class TierStats:
+    """Call statistics for one model tier."""
+    calls: int = 0
+    failures: int = 0
+    escalations: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=1000))
+
+
+@dataclass
+class RequestStats:
+    """End-to-end statistics for requests that started on one tier."""
+    requests: int = 0
+    escalated: int = 0
+    failures: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=1000))
+
+
+def latency_percentiles(latencies: Iterable[float]) -> dict:
+    """Return median and p95 latency in milliseconds, where there is enough data."""
+    latencies = sorted(latencies)
+    return {
+        "median_latency_ms": round(statistics.median(latencies) * 1000)
+        if latencies else None,
+        "p95_latency_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000)
+        if len(latencies) >= 20 else None,
+    }
+
+
+class ModelRouter:
+    """Chooses a model tier per request and records per-tier statistics."""
+
+    def __init__(
+        self,
+        tiers: Optional[tuple[ModelTier, ...]] = None,
+        rule_engine: Optional[RuleEngine] = None,
+    ):
+        """Initialize the router.
+
+        Args:
+            tiers: Model tiers ordered from smallest to largest. Defaults to
+                    MODEL_TIERS with any model IDs set in the environment.
+            rule_engine: Engine used to recognise activities. A new
+                    RuleEngine is created if not provided.
+        """
+        self.tiers = tiers if tiers is not None else configured_tiers()
+        self.rule_engine = rule_engine or RuleEngine()
+        self._stats = {tier.name: TierStats() for tier in self.tiers}
+        self._requests = {tier.name: RequestStats() for tier in self.tiers}
+        self._lock = threading.Lock()
+
+    def route(
+        self,
+        activity_name: str,
+        activity_description: str,
+        location: str = "Nursery",
+        age_groups: Optional[list[AgeGroup]] = None,
+    ) -> RouteDecision:
+        """Score the complexity of an activity and pick a starting tier."""
+        if age_groups is None:
+            age_groups = [AgeGroup.ALL]
+
+        text = f"{activity_name}\n{activity_description}\n{location}"
+        rules = self.rule_engine.match_rules(text, age_groups)
+        confidence = self.rule_engine.confidence(rules)
+
+        score = 0
+        reasons = []
+
+        words = len(activity_description.split())
+        if words > 60:
+            score += 2
+            reasons.append(f"long description ({words} words)")
+        elif words > 25:
+            score += 1
+            reasons.append(f"detailed description ({words} words)")
+
+        # "All ages" is a single mixed group, not one per age band
+        if len(age_groups) >= 3:
+            score += 1
+            reasons.append(f"{len(age_groups)} age groups")
+
+        outing = any(rule.is_outing for rule in rules)
+        if outing:
+            score += 2
+            reasons.append("off-site outing")
+
+        # Activities that match no rules are usually the everyday ones, so
+        # low confidence only counts when the description is also detailed
+        if confidence >= 1.0 and not outing and score > 0:
+            score -= 1
+            reasons.append("well recognised by rule engine")
+        elif confidence == 0 and words > 25:
+            score += 1
+            reasons.append("detailed activity not recognised by rule engine")
+
+        if score <= 1:
+            tier_index = 0
+        elif score <= 3:
+            tier_index = 1
+        else:
+            tier_index = 2
+
+        return RouteDecision(
+            tier_index=min(tier_index, len(self.tiers) - 1),
+            score=score,
+            confidence=confidence,
+            reasons=reasons,
+        )
+
+    def record(
+        self,
+        tier: ModelTier,
+        latency: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        failed: bool = False,
+        escalated: bool = False,
+    ) -> None:
+        """Record the outcome of a model call."""
+        with self._lock:
+            stats = self._stats[tier.name]
+            stats.calls += 1
+            stats.failures += failed
+            stats.escalations += escalated
+            stats.input_tokens += input_tokens
+            stats.output_tokens += output_tokens
+            stats.latencies.append(latency)
+
+    def record_request(
+        self,
+        start_tier: ModelTier,
+        latency: float,
+        calls: list[tuple[ModelTier, int, int]],
+        failed: bool = False,
+    ) -> None:
+        """Record a routed request, including any escalations.
+
+        Args:
+            start_tier: Tier the request was routed to
+            latency: Total time across every call, in seconds
+            calls: (tier, input_tokens, output_tokens) for each call made
+            failed: Whether the request produced no usable output
+        """
+        with self._lock:
+            stats = self._requests[start_tier.name]
+            stats.requests += 1
+            stats.escalated += len(calls) > 1
+            stats.failures += failed
+            for tier, input_tokens, output_tokens in calls:
+                stats.input_tokens += input_tokens
+                stats.output_tokens += output_tokens
+                stats.cost += tier.cost(input_tokens, output_tokens)
+            stats.latencies.append(latency)
+
+    def summary(self) -> dict:
+        """Return per-tier call counts, latency and estimated cost."""
+        with self._lock:
+            result = {}
+            for tier in self.tiers:
+                stats = self._stats[tier.name]
+                result[tier.name] = {
+                    "model": tier.model,
+                    "calls": stats.calls,
+                    "failures": stats.failures,
+                    "escalations": stats.escalations,
+                    **latency_percentiles(stats.latencies),
+                    "input_tokens": stats.input_tokens,
+                    "output_tokens": stats.output_tokens,
+                    "estimated_cost_usd": round(
+                        tier.cost(stats.input_tokens, stats.output_tokens), 4
+                    ),
+                }
+            return result
+
+    def request_summary(self) -> dict:
+        """Return end-to-end latency and cost of requests by starting tier."""
+        with self._lock:
+            result = {}
+            for tier in self.tiers:
+                stats = self._requests[tier.name]
+                result[tier.name] = {
+                    "requests": stats.requests,
+                    "escalated": stats.escalated,
+                    "failures": stats.failures,
+                    **latency_percentiles(stats.latencies),
+                    "input_tokens": stats.input_tokens,
+                    "output_tokens": stats.output_tokens,
+                    "estimated_cost_usd": round(stats.cost, 4),
+                    "cost_per_request_usd": round(stats.cost / stats.requests, 6)
+                    if stats.requests else None,
+                }
+            return result
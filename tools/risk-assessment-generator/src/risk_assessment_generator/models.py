@@ -82,6 +82,7 @@ class RiskAssessment:
     assessor_name: str = ""
     review_date: Optional[date] = None
     additional_notes: str = ""
+    is_rule_based: bool = False
 
     @property
     def overall_risk_level(self) -> str:
@@ -95,3 +96,76 @@ class RiskAssessment:
             key=lambda h: risk_order.index(h.hazard.risk_level)
         )
         return max_risk.hazard.risk_level
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serialisable dictionary."""
+        return {
+            "activity_name": self.activity_name,
+            "activity_description": self.activity_description,
+            "location": self.location,
+            "age_groups": [ag.value for ag in self.age_groups],
+            "assessment_date": self.assessment_date.isoformat(),
+            "assessor_name": self.assessor_name,
+            "review_date": self.review_date.isoformat() if self.review_date else None,
+            "overall_risk_level": self.overall_risk_level,
+            "hazards": [
+                {
+                    "description": hwm.hazard.description,
+                    "severity": hwm.hazard.severity.value,
+                    "likelihood": hwm.hazard.likelihood.value,
+                    "risk_level": hwm.hazard.risk_level,
+                    "who_at_risk": hwm.hazard.who_at_risk,
+                    "existing_controls": list(hwm.existing_controls),
+                    "additional_controls": [
+                        {
+                            "action": ctrl.action,
+                            "responsible_person": ctrl.responsible_person,
+                        }
+                        for ctrl in hwm.additional_controls
+                    ],
+                    "residual_risk": hwm.residual_risk,
+                }
+                for hwm in self.hazards
+            ],
+            "additional_notes": self.additional_notes,
+            "is_rule_based": self.is_rule_based,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RiskAssessment":
+        """Create a RiskAssessment from a dictionary produced by to_dict."""
+        hazards = [
+            HazardWithMitigation(
+                hazard=Hazard(
+                    description=h["description"],
+                    severity=Severity(h["severity"]),
+                    likelihood=Likelihood(h["likelihood"]),
+                    who_at_risk=h["who_at_risk"],
+                ),
+                existing_controls=list(h.get("existing_controls", [])),
+                additional_controls=[
+                    MitigationStrategy(
+                        action=ctrl["action"],
+                        responsible_person=ctrl.get("responsible_person", "Nursery Staff"),
+                    )
+                    for ctrl in h.get("additional_controls", [])
+                ],
+                residual_risk=h.get("residual_risk", "Low"),
+            )
+            for h in data.get("hazards", [])
+        ]
+
+        review_date = data.get("review_date")
+        return cls(
+            activity_name=data["activity_name"],
+            activity_description=data.get("activity_description", ""),
+            location=data.get("location", "Nursery"),
+            age_groups=[AgeGroup(ag) for ag in data.get("age_groups", [])] or [AgeGroup.ALL],
+            hazards=hazards,
+            assessment_date=date.fromisoformat(data["assessment_date"])
+            if data.get("assessment_date") else date.today(),
+            assessor_name=data.get("assessor_name", ""),
+            review_date=date.fromisoformat(review_date) if review_date else None,
+            additional_notes=data.get("additional_notes", ""),
+            is_rule_based=data.get("is_rule_based", False),
+        )
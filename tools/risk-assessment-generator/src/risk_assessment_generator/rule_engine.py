@@ -0,0 +1,550 @@
+"""Offline rule-based hazard identification.
+
+Maps activity keywords, materials and age groups to hazard templates drawn
+from the EYFS 2024 requirements in ``SYSTEM_PROMPT``. Keywords are matched
+with a precompiled Aho-Corasick automaton, so an assessment can be produced
+locally without a network call - as an instant draft, or as a fallback when
+the Claude API is unavailable.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from .models import (
+    AgeGroup,
+    Hazard,
+    HazardWithMitigation,
+    Likelihood,
+    MitigationStrategy,
+    RiskAssessment,
+    Severity,
+)
+
+UNDER_THREES = frozenset({AgeGroup.BABY, AgeGroup.TODDLER, AgeGroup.PRESCHOOL})
+UNDER_TWOS = frozenset({AgeGroup.BABY, AgeGroup.TODDLER})
+
+# EYFS 2024 staff:child ratios (3.39-3.46)
+RATIO_NOTES = {
+    AgeGroup.BABY: "Children under 2: 1 adult to 3 children",
+    AgeGroup.TODDLER: "Children under 2: 1 adult to 3 children",
+    AgeGroup.PRESCHOOL: "Children aged 2: 1 adult to 4 children",
+    AgeGroup.PRE_KINDERGARTEN: "Children aged 3+: 1 adult to 8 children (or 1:13 with a qualified teacher)",
+    AgeGroup.RECEPTION: "Children aged 3+: 1 adult to 8 children (or 1:13 with a qualified teacher)",
+}
+
+# EYFS 2024 indoor space requirements
+SPACE_NOTES = {
+    AgeGroup.BABY: "3.5m² per child (under 2s)",
+    AgeGroup.TODDLER: "3.5m² per child (under 2s)",
+    AgeGroup.PRESCHOOL: "2.5m² per child (2-3s)",
+    AgeGroup.PRE_KINDERGARTEN: "2.3m² per child (3-5s)",
+    AgeGroup.RECEPTION: "2.3m² per child (3-5s)",
+}
+
+OUTDOOR_KEYWORDS = ("outdoor", "outside", "garden", "playground", "park", "field", "forest", "woods", "beach")
+
+
+@dataclass(frozen=True)
+class HazardRule:
+    """A hazard template triggered by activity keywords."""
+    name: str
+    keywords: tuple[str, ...]
+    description: str
+    severity: Severity
+    likelihood: Likelihood
+    who_at_risk: str = "Children"
+    existing_controls: tuple[str, ...] = ()
+    additional_controls: tuple[tuple[str, str], ...] = ()
+    residual_risk: str = "Low"
+    age_groups: Optional[frozenset[AgeGroup]] = None
+    is_outing: bool = False
+
+    def applies_to(self, age_groups: Iterable[AgeGroup]) -> bool:
+        """Check whether the rule is relevant for the given age groups."""
+        if self.age_groups is None:
+            return True
+        return any(ag == AgeGroup.ALL or ag in self.age_groups for ag in age_groups)
+
+    def to_hazard(self) -> HazardWithMitigation:
+        """Create a fresh HazardWithMitigation from this template."""
+        return HazardWithMitigation(
+            hazard=Hazard(
+                description=self.description,
+                severity=self.severity,
+                likelihood=self.likelihood,
+                who_at_risk=self.who_at_risk,
+            ),
+            existing_controls=list(self.existing_controls),
+            additional_controls=[
+                MitigationStrategy(action=action, responsible_person=person)
+                for action, person in self.additional_controls
+            ],
+            residual_risk=self.residual_risk,
+        )
+
+
+HAZARD_RULES: tuple[HazardRule, ...] = (
+    HazardRule(
+        name="choking",
+        keywords=(
+            "bead", "beads", "button", "buttons", "marble", "marbles", "coin", "coins",
+            "small parts", "small objects", "pebble", "pebbles", "dried pasta", "pasta",
+            "beans", "lentils", "rice", "grape", "grapes", "seeds", "lego", "sequins",
+            "pom poms", "pompoms", "gems", "shells", "conkers", "blueberries", "cherry tomatoes",
+        ),
+        description="Choking on small items under 4.5cm diameter (mouthing by under-3s)",
+        severity=Severity.HIGH,
+        likelihood=Likelihood.POSSIBLE,
+        existing_controls=(
+            "Resources checked with a choke tester before use",
+            "Paediatric first aider on site",
+        ),
+        additional_controls=(
+            ("Remove or supervise items under 4.5cm for children under 3", "Room Leader"),
+            ("Cut round foods such as grapes lengthways into quarters", "All Staff"),
+            ("Count small items out and back in after the activity", "All Staff"),
+        ),
+        residual_risk="Medium",
+        age_groups=UNDER_THREES,
+    ),
+    HazardRule(
+        name="strangulation",
+        keywords=(
+            "ribbon", "ribbons", "string", "strings", "cord", "cords", "rope", "ropes",
+            "wool", "yarn", "lanyard", "lanyards", "scarf", "scarves", "threading",
+            "blind cord", "washing line",
+        ),
+        description="Strangulation or entanglement from cords, strings or ribbons over 22cm",
+        severity=Severity.HIGH,
+        likelihood=Likelihood.UNLIKELY,
+        existing_controls=("Cords and strings stored out of reach when not in use",),
+        additional_controls=(
+            ("Cut cords, strings and ribbons to under 22cm for unsupervised use", "Room Leader"),
+            ("Never leave children unsupervised with longer lengths", "All Staff"),
+        ),
+        residual_risk="Low",
+    ),
+    HazardRule(
+        name="drowning",
+        keywords=(
+            "water", "water play", "paddling pool", "pool", "swimming", "splash",
+            "water tray", "puddles", "pond", "bath", "sink",
+        ),
+        description="Drowning risk - young children can drown in very shallow water",
+        severity=Severity.HIGH,
+        likelihood=Likelihood.UNLIKELY,
+        existing_controls=("Water trays and pools emptied immediately after use",),
+        additional_controls=(
+            ("Maintain constant, direct supervision of water at all times", "All Staff"),
+            ("Keep water depth to the minimum needed for the activity", "Room Leader"),
+        ),
+        residual_risk="Low",
+    ),
+    HazardRule(
+        name="slips",
+        keywords=(
+            "water", "water play", "splash", "messy play", "slime", "gloop", "foam",
+            "shaving foam", "bubbles", "ice", "paint", "painting", "wet", "puddles", "sand",
+        ),
+        description="Slips and falls on wet or slippery floor surfaces",
+        severity=Severity.MEDIUM,
+        likelihood=Likelihood.POSSIBLE,
+        who_at_risk="Both",
+        existing_controls=("Spills mopped up promptly",),
+        additional_controls=(
+            ("Use absorbent mats or towels around the activity area", "Room Leader"),
+            ("Display wet floor signage and clean up spills immediately", "All Staff"),
+        ),
+        residual_risk="Low",
+    ),
+    HazardRule(
+        name="sand",
+        keywords=("sand", "sandpit", "sand pit", "sand tray"),
+        description="Sand in eyes or ingestion of sand",
+        severity=Severity.LOW,
+        likelihood=Likelihood.POSSIBLE,
+        existing_controls=("Sandpit covered when not in use to prevent contamination",),
+        additional_controls=(
+            ("Remind children not to throw sand and model safe play", "All Staff"),
+            ("Check sand for foreign objects and animal fouling before use", "Room Leader"),
+        ),
+        residual_risk="Low",
+    ),
+    HazardRule(
+        name="art_materials",
+        keywords=(
+            "paint", "painting", "glue", "glitter", "playdough", "play dough", "clay",
+            "crayons", "chalk", "pens", "slime", "craft", "collage",
+        ),
+        description="Ingestion of, or skin reaction to, art and craft materials",
+        severity=Severity.LOW,
+        likelihood=Likelihood.POSSIBLE,
+        existing_controls=("Non-toxic, age-appropriate materials used",),
+        additional_controls=(
+            ("Check allergy records for ingredients such as wheat in playdough", "Room Leader"),
+            ("Ensure children wash hands after the activity", "All Staff"),
+        ),
+        residual_risk="Low",
+    ),
+    HazardRule(
+        name="allergies",
+        keywords=(
+            "food", "snack", "snacks", "cooking", "baking", "tasting", "fruit", "meal",
+            "lunch", "picnic", "sandwich", "sandwiches", "cake", "biscuits", "nuts",
+            "milk", "eggs", "flour", "pasta", "playdough", "play dough",
+        ),
+        description="Allergic reaction to food or food-based materials",
+        severity=Severity.HIGH,
+        likelihood=Likelihood.POSSIBLE,
+        existing_controls=(
+            "Allergy and dietary information obtained from parents and displayed",
+            "Fresh drinking water available at all times",
+        ),
+        additional_controls=(
+            ("Check every ingredient against children's allergy records before the activity", "Room Leader"),
+            ("Ensure prescribed medication (e.g., auto-injectors) is on hand", "Room Leader"),
+        ),
+        residual_risk="Medium",
+    ),
+    HazardRule(
+        name="food_hygiene",
+        keywords=(
+            "food", "snack", "snacks", "cooking", "baking", "tasting", "meal",
+            "lunch", "picnic", "sandwich", "sandwiches",
+        ),
+        description="Food poisoning from poor food hygiene or handling",
+        severity=Severity.MEDIUM,
+        likelihood=Likelihood.UNLIKELY,
+        who_at_risk="Both",
+        existing_controls=("Staff handling food hold food hygiene training",),
+        additional_controls=(
+            ("Ensure handwashing before handling food", "All Staff"),
+            ("Check use-by dates and storage temperatures", "Room Leader"),
+        ),
+        residual_risk="Low",
+    ),
+    HazardRule(
+        name="burns",
+        keywords=(
+            "cooking", "baking", "oven", "hob", "kettle", "hot", "candle", "candles",
+            "campfire", "fire", "bonfire", "toaster", "hot drinks",
+        ),
+        description="Burns or scalds from hot surfaces, liquids or flames",
+        severity=Severity.HIGH,
+        likelihood=Likelihood.UNLIKELY,
+        who_at_risk="Both",
+        existing_controls=("Hot drinks kept away from children",),
+        additional_controls=(
+            ("Only adults to use ovens, hobs and handle hot items", "All Staff"),
+            ("Keep children at a safe distance from heat sources", "Room Leader"),
+        ),
+        residual_risk="Low",
+    ),
+    HazardRule(
+        name="sharps",
+        keywords=(
+            "scissors", "knife", "knives", "woodwork", "hammer", "saw", "tools",
+            "nails", "screwdriver", "peeler", "grater", "cutting",
+        ),
+        description="Cuts or puncture wounds from sharp tools",
+        severity=Severity.MEDIUM,
+        likelihood=Likelihood.POSSIBLE,
+        existing_controls=("Child-safe tools provided for the age group",),
+        additional_controls=(
+            ("Teach and model safe use of tools before the activity", "Room Leader"),
+            ("Provide one-to-one or small group supervision when tools are used", "All Staff"),
+        ),
+        residual_risk="Low",
+    ),
+    HazardRule(
+        name="falls_from_height",
+        keywords=(
+            "climbing", "climbing frame", "climb", "slide", "trampoline", "balance",
+            "balancing", "tree", "trees", "steps", "stairs", "wall", "obstacle course",
+        ),
+        description="Falls from height when climbing or balancing",
+        severity=Severity.MEDIUM,
+        likelihood=Likelihood.POSSIBLE,
+        existing_controls=(
+            "Equipment suitable for age and stage and regularly inspected",
+            "Safety surfacing beneath climbing equipment",
+        ),
+        additional_controls=(
+            ("Check equipment and surfacing before each session", "Room Leader"),
+            ("Position staff to supervise climbing equipment at all times", "All Staff"),
+        ),
+        residual_risk="Low",
+    ),
+    HazardRule(
+        name="collisions",
+        keywords=(
+            "running", "race", "races", "ball", "balls", "football", "sports",
+            "sports day", "chase", "tag", "bikes", "scooters", "trikes", "dancing",
+            "parachute", "physical",
+        ),
+        description="Collisions and trips during active physical play",
+        severity=Severity.LOW,
+        likelihood=Likelihood.POSSIBLE,
+        existing_controls=("Play area checked and cleared of obstacles",),
+        additional_controls=(
+            ("Provide enough space and set clear boundaries for the activity", "Room Leader"),
+            ("Separate wheeled toys from running games", "All Staff"),
+        ),
+        residual_risk="Low",
+    ),
+    HazardRule(
+        name="sun_and_weather",
+        keywords=OUTDOOR_KEYWORDS + ("sun", "sunny", "snow", "rain", "weather", "picnic"),
+        description="Sunburn, heat exhaustion or cold exposure in outdoor weather",
+        severity=Severity.MEDIUM,
+        likelihood=Likelihood.POSSIBLE,
+        existing_controls=("Parents provide weather appropriate clothing",),
+        additional_controls=(
+            ("Apply sun protection and provide hats and shade in warm weather", "All Staff"),
+            ("Ensure fresh drinking water is available outdoors", "Room Leader"),
+        ),
+        residual_risk="Low",
+    ),
+    HazardRule(
+        name="plants_and_soil",
+        keywords=(
+            "gardening", "planting", "plants", "soil", "compost", "mud", "mud kitchen",
+            "forest", "woods", "berries", "mushrooms", "leaves", "nature walk",
+        ),
+        description="Contact with poisonous plants, fungi or contaminated soil",
+        severity=Severity.MEDIUM,
+        likelihood=Likelihood.UNLIKELY,
+        existing_controls=("Outdoor area checked for poisonous plants",),
+        additional_controls=(
+            ("Check the area for fungi, berries and animal fouling before use", "Room Leader"),
+            ("Ensure children wash hands thoroughly afterwards", "All Staff"),
+        ),
+        residual_risk="Low",
+    ),
+    HazardRule(
+        name="animals",
+        keywords=(
+            "animal", "animals", "pet", "pets", "farm", "petting", "zoo", "chickens",
+            "dog", "dogs", "guinea pig", "rabbit", "minibeasts", "bugs", "insects",
+        ),
+        description="Infection from animal contact, bites or scratches",
+        severity=Severity.MEDIUM,
+        likelihood=Likelihood.POSSIBLE,
+        existing_controls=("Handwashing facilities available",),
+        additional_controls=(
+            ("Supervise all contact with animals and prevent hand-to-mouth contact", "All Staff"),
+            ("Ensure thorough handwashing with soap after animal contact", "All Staff"),
+        ),
+        residual_risk="Low",
+    ),
+    HazardRule(
+        name="outing",
+        keywords=(
+            "outing", "trip", "visit", "walk", "nature walk", "park", "farm", "zoo",
+            "library", "shop", "shops", "museum", "beach", "bus", "coach", "train", "road",
+        ),
+        description="Child going missing or road traffic injury during an outing",
+        severity=Severity.HIGH,
+        likelihood=Likelihood.UNLIKELY,
+        existing_controls=(
+            "Parental consent obtained for outings",
+            "Mobile phone and emergency contact details taken",
+        ),
+        additional_controls=(
+            ("Complete an outing risk assessment including the adult to child ratio (EYFS 3.64)", "Manager"),
+            ("Carry out regular head counts and use high-visibility vests", "All Staff"),
+            ("Ensure a paediatric first aider and first aid kit accompany the outing", "Manager"),
+        ),
+        residual_risk="Medium",
+        is_outing=True,
+    ),
+)
+
+
+class KeywordIndex:
+    """Aho-Corasick automaton for matching many keywords in a single pass.
+
+    Matches are restricted to whole words, so "pool" does not match "pooling".
+    """
+
+    def __init__(self, keywords: dict[str, Iterable[int]]):
+        """Build the automaton.
+
+        Args:
+            keywords: Mapping of lowercase keyword to the payload ids it emits
+        """
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[tuple[int, tuple[int, ...]]]] = [[]]
+
+        for keyword, payload in keywords.items():
+            node = 0
+            for char in keyword:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = nxt
+            self._output[node].append((len(keyword), tuple(payload)))
+
+        # Breadth-first pass to compute failure links and merge outputs
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def search(self, text: str) -> set[int]:
+        """Return the payload ids of every whole-word keyword found in text."""
+        text = text.lower()
+        goto, fail, output = self._goto, self._fail, self._output
+        found: set[int] = set()
+        node = 0
+        length = len(text)
+
+        for end, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not output[node]:
+                continue
+            if end + 1 < length and text[end + 1].isalnum():
+                continue
+            for size, payload in output[node]:
+                start = end - size + 1
+                if start == 0 or not text[start - 1].isalnum():
+                    found.update(payload)
+
+        return found
+
+
+class RuleEngine:
+    """Identifies hazards locally from keyword-triggered hazard templates."""
+
+    def __init__(self, rules: Iterable[HazardRule] = HAZARD_RULES):
+        """Precompile the keyword index for the given rules.
+
+        Args:
+            rules: Hazard templates to match against. Defaults to HAZARD_RULES.
+        """
+        self.rules = tuple(rules)
+        keywords: dict[str, set[int]] = {}
+        for i, rule in enumerate(self.rules):
+            for keyword in rule.keywords:
+                keywords.setdefault(keyword.lower(), set()).add(i)
+        self._index = KeywordIndex(keywords)
+        self._outdoor_index = KeywordIndex({keyword: (0,) for keyword in OUTDOOR_KEYWORDS})
+
+    def match_rules(
+        self,
+        text: str,
+        age_groups: Optional[list[AgeGroup]] = None,
+    ) -> list[HazardRule]:
+        """Return the rules triggered by text, in rule order.
+
+        Args:
+            text: Free text to scan (activity name, description, location)
+            age_groups: Age groups participating; rules that do not apply
+                        to any of them are dropped
+        """
+        if age_groups is None:
+            age_groups = [AgeGroup.ALL]
+
+        return [
+            self.rules[i]
+            for i in sorted(self._index.search(text))
+            if self.rules[i].applies_to(age_groups)
+        ]
+
+    def confidence(self, rules: list[HazardRule]) -> float:
+        """Estimate how well matched rules cover an activity, from 0 to 1.
+
+        One matching template is partial recognition; two or more mean the
+        engine knows the activity well. None means it is outside its
+        knowledge.
+        """
+        return min(1.0, len(rules) / 2)
+
+    def identify_hazards(
+        self,
+        activity_name: str,
+        activity_description: str,
+        location: str = "Nursery",
+        age_groups: Optional[list[AgeGroup]] = None,
+    ) -> RiskAssessment:
+        """Build a draft risk assessment without calling the Claude API.
+
+        Args:
+            activity_name: Name of the activity (e.g., "Water Play")
+            activity_description: Detailed description of what the activity involves
+            location: Where the activity takes place
+            age_groups: List of age groups participating
+
+        Returns:
+            RiskAssessment built from the matching hazard templates
+
+        Raises:
+            ValueError: If no hazard template matches the activity
+        """
+        if age_groups is None:
+            age_groups = [AgeGroup.ALL]
+
+        text = f"{activity_name}\n{activity_description}\n{location}"
+        rules = self.match_rules(text, age_groups)
+        # An assessment with no hazards would read as low risk, not as unknown
+        if not rules:
+            raise ValueError(
+                f"No hazard templates match '{activity_name}'; "
+                "a rule-based draft cannot be produced for this activity"
+            )
+
+        return RiskAssessment(
+            activity_name=activity_name,
+            activity_description=activity_description,
+            location=location,
+            age_groups=age_groups,
+            hazards=[rule.to_hazard() for rule in rules],
+            additional_notes=self._build_notes(rules, location, age_groups),
+            is_rule_based=True,
+        )
+
+    def _build_notes(
+        self,
+        rules: list[HazardRule],
+        location: str,
+        age_groups: list[AgeGroup],
+    ) -> str:
+        """Build EYFS ratio, space and supervision notes for the assessment."""
+        groups = [ag for ag in AgeGroup if ag != AgeGroup.ALL]
+        if AgeGroup.ALL not in age_groups:
+            groups = [ag for ag in groups if ag in age_groups]
+
+        notes = ["This is a rule-based draft assessment and should be reviewed before use."]
+
+        ratios = list(dict.fromkeys(RATIO_NOTES[ag] for ag in groups))
+        notes.append("EYFS staff:child ratios (3.39-3.46): " + "; ".join(ratios) + ".")
+
+        if any(rule.is_outing for rule in rules):
+            notes.append(
+                "EYFS 3.64: the outing risk assessment must include the required "
+                "adult to child ratio, which may need to exceed the minimum."
+            )
+        elif not self._outdoor_index.search(location):
+            spaces = list(dict.fromkeys(SPACE_NOTES[ag] for ag in groups))
+            notes.append("Indoor space requirements: " + "; ".join(spaces) + ".")
+
+        if UNDER_TWOS.intersection(groups):
+            notes.append(
+                "Under-2s explore by mouthing objects and need close supervision throughout."
+            )
+
+        notes.append("A paediatric first aider must be available at all times.")
+        return " ".join(notes)
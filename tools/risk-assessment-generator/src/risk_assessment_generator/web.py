@@ -1,12 +1,31 @@
 """Flask web application for Risk Assessment Generator."""
 
+import gzip
+import hashlib
+import json
 import os
+import threading
+import unicodedata
 import uuid
-from flask import Flask, render_template, request, flash, redirect, url_for, send_file
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import quote
+
+from flask import Flask, Response, render_template, request, session, flash, redirect, url_for, jsonify
+from markupsafe import Markup
+from werkzeug.http import is_resource_modified
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; fall back to gzip
+    brotli = None
 
 from .hazard_identifier import HazardIdentifier
+from .model_router import ModelRouter
 from .models import AgeGroup
-from .document_generator import generate_docx
+from .exporters import RENDERERS, AssessmentView
+from .analytics import COLUMNS, HazardTable
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("SECRET_KEY", "dev-key-change-in-production")
@@ -15,6 +34,47 @@ app.secret_key = os.environ.get("SECRET_KEY", "dev-key-change-in-production")
 # In production, you'd want to use a proper cache like Redis
 assessment_cache = {}
 
+# Content hash and storage time of each cached assessment, for conditional GET
+assessment_versions = {}
+
+
+class LRUCache:
+    """A thread-safe dictionary that evicts the least recently used entries."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def __setitem__(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# Rendered output keyed by content hash, so repeat views and downloads skip rendering
+hazard_fragment_cache = LRUCache(maxsize=4096)
+page_cache = LRUCache(maxsize=256)
+download_cache = LRUCache(maxsize=64)
+
+# Columnar view of every cached assessment, for cross-assessment analytics
+analytics_table = HazardTable()
+
+# Shared across requests so routing statistics accumulate
+model_router = ModelRouter()
+
 AGE_GROUP_MAP = {
     "baby": AgeGroup.BABY,
     "toddler": AgeGroup.TODDLER,
@@ -24,6 +84,84 @@ AGE_GROUP_MAP = {
 }
 
 
+def content_hash(data) -> str:
+    """Hash JSON-serialisable data into a short hex digest."""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def store_assessment(assessment) -> str:
+    """Cache an assessment and record its version; returns its id."""
+    assessment_id = str(uuid.uuid4())
+    assessment_cache[assessment_id] = assessment
+    assessment_versions[assessment_id] = (
+        content_hash(assessment.to_dict()),
+        datetime.now(timezone.utc).replace(microsecond=0),
+    )
+    analytics_table.add(assessment)
+    return assessment_id
+
+
+def not_modified(etag: str, last_modified: datetime, vary: Optional[str] = None):
+    """Return a 304 response if the client's cached copy is still current."""
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return None
+    response = Response(status=304)
+    return set_cache_headers(response, etag, last_modified, vary)
+
+
+def set_cache_headers(
+    response: Response,
+    etag: str,
+    last_modified: datetime,
+    vary: Optional[str] = None,
+) -> Response:
+    """Add validators so the client revalidates rather than refetching.
+
+    vary names a request header the response varies on, and must match
+    between 200 and 304 responses for the same resource.
+    """
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    if vary:
+        response.vary.add(vary)
+    return response
+
+
+def choose_encoding() -> str:
+    """Pick the best supported content encoding from Accept-Encoding."""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return "identity"
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a response body with the given content encoding."""
+    if encoding == "br":
+        return brotli.compress(data)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    return data
+
+
+def render_hazard_fragments(assessment) -> list[Markup]:
+    """Render each hazard card, reusing cached HTML for unchanged hazards."""
+    fragments = []
+    for number, hwm in enumerate(assessment.hazards, 1):
+        key = (number, repr(hwm))
+        fragment = hazard_fragment_cache.get(key)
+        if fragment is None:
+            fragment = Markup(render_template("_hazard.html", hwm=hwm, number=number))
+            hazard_fragment_cache[key] = fragment
+        fragments.append(fragment)
+    return fragments
+
+
 @app.route("/", methods=["GET"])
 def index():
     """Show the main form."""
@@ -53,7 +191,7 @@ def generate():
         return redirect(url_for("index"))
 
     try:
-        identifier = HazardIdentifier(api_key=api_key)
+        identifier = HazardIdentifier(api_key=api_key, router=model_router)
         assessment = identifier.identify_hazards(
             activity_name=activity_name,
             activity_description=activity_description,
@@ -62,36 +200,158 @@ def generate():
         )
         assessment.assessor_name = assessor_name
 
-        # Store assessment for download
-        assessment_id = str(uuid.uuid4())
-        assessment_cache[assessment_id] = assessment
-
-        return render_template("result.html", assessment=assessment, assessment_id=assessment_id)
+        # Store assessment for viewing and download
+        assessment_id = store_assessment(assessment)
 
     except Exception as e:
         flash(f"Error generating assessment: {str(e)}", "error")
         return redirect(url_for("index"))
 
+    return redirect(url_for("result", assessment_id=assessment_id), code=303)
+
+
+@app.route("/assessment/<assessment_id>")
+def result(assessment_id):
+    """Show a generated assessment, served from cache where possible."""
+    assessment = assessment_cache.get(assessment_id)
+
+    if not assessment:
+        flash("Assessment not found. Please generate a new one.", "error")
+        return redirect(url_for("index"))
+
+    etag, last_modified = assessment_versions[assessment_id]
+    encoding = choose_encoding()
+    variant_etag = f"{etag}-{encoding}"
+
+    # Pages embed pending flash messages from base.html, so a page rendered
+    # while any are pending is specific to this request and is not cached,
+    # nor answered with a 304 that would leave the flashes pending
+    cacheable = "_flashes" not in session
+    if cacheable:
+        response = not_modified(variant_etag, last_modified, vary="Accept-Encoding")
+        if response is not None:
+            return response
+
+    key = (etag, assessment_id, encoding)
+    body = page_cache.get(key) if cacheable else None
+    if body is None:
+        html = render_template(
+            "result.html",
+            assessment=assessment,
+            assessment_id=assessment_id,
+            hazard_fragments=render_hazard_fragments(assessment),
+        )
+        body = compress(html.encode("utf-8"), encoding)
+        if cacheable:
+            page_cache[key] = body
+
+    response = Response(body, mimetype="text/html")
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    if not cacheable:
+        response.vary.add("Accept-Encoding")
+        response.cache_control.no_store = True
+        return response
+    return set_cache_headers(response, variant_etag, last_modified, vary="Accept-Encoding")
+
 
 @app.route("/download/<assessment_id>")
 def download(assessment_id):
-    """Download assessment as DOCX."""
+    """Download assessment as DOCX, or another format via ?format=."""
     assessment = assessment_cache.get(assessment_id)
 
     if not assessment:
         flash("Assessment not found. Please generate a new one.", "error")
         return redirect(url_for("index"))
 
-    docx_buffer = generate_docx(assessment)
+    renderer = RENDERERS.get(request.args.get("format", "docx").lower())
+    if renderer is None:
+        flash("Unsupported download format.", "error")
+        return redirect(url_for("index"))
+
+    etag, last_modified = assessment_versions[assessment_id]
+    variant_etag = f"{etag}-{renderer.name}"
 
-    filename = f"risk_assessment_{assessment.activity_name.lower().replace(' ', '_')}.docx"
+    response = not_modified(variant_etag, last_modified)
+    if response is not None:
+        return response
 
-    return send_file(
-        docx_buffer,
-        as_attachment=True,
-        download_name=filename,
-        mimetype="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-    )
+    key = (etag, renderer.name)
+    body = download_cache.get(key)
+    if body is None:
+        body = cache_chunks(
+            key, renderer.render(AssessmentView.from_assessment(assessment))
+        )
+
+    response = Response(body, mimetype=renderer.mimetype)
+    set_download_name(response, renderer.filename(assessment))
+    return set_cache_headers(response, variant_etag, last_modified)
+
+
+def set_download_name(response: Response, filename: str) -> None:
+    """Mark a response as an attachment, encoding non-ASCII names per RFC 5987.
+
+    Mirrors flask.send_file: an ASCII-only fallback is sent as filename and
+    the full name as filename*.
+    """
+    try:
+        filename.encode("ascii")
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize("NFKD", filename)
+        simple = simple.encode("ascii", "ignore").decode("ascii")
+        quoted = quote(filename, safe="!#$&+-.^_`|~")
+        names = {"filename": simple, "filename*": f"UTF-8''{quoted}"}
+    else:
+        names = {"filename": filename}
+
+    response.headers.set("Content-Disposition", "attachment", **names)
+
+
+def cache_chunks(key, chunks):
+    """Stream chunks through, caching the complete output once finished."""
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    download_cache[key] = b"".join(parts)
+
+
+@app.route("/api/analytics")
+def analytics():
+    """Query hazards across all generated assessments as JSON.
+
+    Query parameters:
+        by: Column to group by (repeatable, default "hazard")
+        limit: Maximum number of results (default 20)
+        controls: If set, list matching additional controls instead
+        <column>: Filter on a column value (repeatable)
+    """
+    where = {name: request.args.getlist(name) for name in COLUMNS if name in request.args}
+    limit = request.args.get("limit", 20, type=int)
+
+    try:
+        if request.args.get("controls"):
+            results = analytics_table.controls(where=where, limit=limit)
+        else:
+            by = request.args.getlist("by") or ["hazard"]
+            results = analytics_table.count_by(by, where=where, limit=limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "assessments": analytics_table.assessment_count,
+        "hazards": len(analytics_table),
+        "results": results,
+    })
+
+
+@app.route("/api/routing-stats")
+def routing_stats():
+    """Per-model call statistics, and per-request totals by starting tier, as JSON."""
+    return jsonify({
+        "tiers": model_router.summary(),
+        "requests": model_router.request_summary(),
+    })
 
 
 def run_server(host="127.0.0.1", port=5000, debug=False):
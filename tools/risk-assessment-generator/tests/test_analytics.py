@@ -0,0 +1,138 @@
+"""Tests for cross-assessment hazard analytics."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from risk_assessment_generator.analytics import HazardTable
+from risk_assessment_generator.models import (
+    AgeGroup,
+    Hazard,
+    HazardWithMitigation,
+    Likelihood,
+    MitigationStrategy,
+    RiskAssessment,
+    Severity,
+)
+
+
+def make_assessment(location, age_groups, hazards):
+    return RiskAssessment(
+        activity_name="Activity",
+        activity_description="",
+        location=location,
+        age_groups=age_groups,
+        hazards=[
+            HazardWithMitigation(
+                hazard=Hazard(description, Severity.HIGH, Likelihood.POSSIBLE, "Children"),
+                additional_controls=[MitigationStrategy(f"Action {i}", person) for i, person in enumerate(people)],
+                residual_risk=residual,
+            )
+            for description, residual, people in hazards
+        ],
+    )
+
+
+@pytest.fixture
+def table():
+    return HazardTable.from_assessments([
+        make_assessment("Room 1", [AgeGroup.TODDLER], [
+            ("Choking", "Medium", ["Room Leader", "Room Leader"]),
+            ("Slips", "Low", ["All Staff"]),
+        ]),
+        make_assessment("Room 2", [AgeGroup.ALL], [
+            ("Choking", "High", ["Room Leader"]),
+        ]),
+        make_assessment("Garden", [AgeGroup.RECEPTION], [
+            ("Sunburn", "Low", ["All Staff", "Manager"]),
+        ]),
+    ])
+
+
+def test_count_by_hazard_column(table):
+    assert table.count_by("hazard") == [
+        {"hazard": "Choking", "count": 2},
+        {"hazard": "Slips", "count": 1},
+        {"hazard": "Sunburn", "count": 1},
+    ]
+    assert table.count_by("location", where={"residual_risk": ["Medium", "High"]}) == [
+        {"location": "Room 1", "count": 1},
+        {"location": "Room 2", "count": 1},
+    ]
+
+
+def test_control_filter_counts_each_hazard_once(table):
+    # The Room 1 choking hazard has two Room Leader controls
+    assert table.count_by("hazard", where={"responsible_person": "Room Leader"}) == [
+        {"hazard": "Choking", "count": 2},
+    ]
+    assert table.count_by(
+        "location", where={"responsible_person": "Room Leader", "residual_risk": "High"}
+    ) == [{"location": "Room 2", "count": 1}]
+
+
+def test_grouping_by_control_column_counts_controls(table):
+    assert table.count_by("responsible_person", where={"location": "Room 1"}) == [
+        {"responsible_person": "Room Leader", "count": 2},
+        {"responsible_person": "All Staff", "count": 1},
+    ]
+
+
+def test_controls_filters_on_control_and_hazard_columns(table):
+    controls = table.controls(where={"responsible_person": "All Staff", "location": "Garden"})
+
+    assert controls == [{
+        "activity": "Activity",
+        "location": "Garden",
+        "hazard": "Sunburn",
+        "residual_risk": "Low",
+        "responsible_person": "All Staff",
+        "action": "Action 0",
+    }]
+
+
+def test_age_group_filter_includes_all_ages(table):
+    assert table.count_by("location", where={"age_group": "1-2 years"}) == [
+        {"location": "Room 1", "count": 2},
+        {"location": "Room 2", "count": 1},
+    ]
+
+
+def test_all_ages_filter_matches_every_row(table):
+    where = {"age_group": "All ages"}
+    assert table.count_by("responsible_person", where=where) == table.count_by("responsible_person")
+    assert table.controls(where=where) == table.controls()
+    assert table.count_by("location", where=where) == table.count_by("location")
+
+
+def test_unknown_column_raises(table):
+    with pytest.raises(ValueError):
+        table.count_by("nope")
+    with pytest.raises(ValueError):
+        table.controls(where={"nope": "x"})
+
+
+def test_concurrent_adds_and_queries_keep_controls_aligned():
+    assessments = [
+        make_assessment(f"Room {i}", [AgeGroup.TODDLER], [("Choking", "Low", ["Room Leader"])])
+        for i in range(200)
+    ]
+    table = HazardTable()
+
+    def query():
+        for _ in range(50):
+            table.count_by("location", where={"responsible_person": "Room Leader"})
+            table.count_by(["location", "responsible_person"])
+            table.controls(where={"location": "Room 0"})
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(query) for _ in range(3)]
+        for assessment in assessments:
+            table.add(assessment)
+        for future in futures:
+            future.result()
+
+    records = table.controls()
+    assert len(records) == 200
+    assert all(record["location"] == f"Room {i}" for i, record in enumerate(records))
+    assert all(group["count"] == 1 for group in table.count_by(["location", "responsible_person"]))
@@ -0,0 +1,110 @@
+"""Tests for the multi-format exporters."""
+
+import csv
+import io
+import json
+import re
+
+from risk_assessment_generator.exporters import (
+    AssessmentView,
+    _PdfLayout,
+    _PdfWriter,
+    render,
+)
+from risk_assessment_generator.models import (
+    AgeGroup,
+    Hazard,
+    HazardWithMitigation,
+    Likelihood,
+    MitigationStrategy,
+    RiskAssessment,
+    Severity,
+)
+
+
+def make_assessment(hazard_count=3):
+    return RiskAssessment(
+        activity_name="Café Trip",
+        activity_description="Walk to the café for a snack",
+        location="High Street",
+        age_groups=[AgeGroup.PRESCHOOL],
+        hazards=[
+            HazardWithMitigation(
+                hazard=Hazard(f"Hazard {i} (with brackets)", Severity.HIGH, Likelihood.POSSIBLE, "Children"),
+                existing_controls=["Head counts"],
+                additional_controls=[MitigationStrategy("Hi-vis vests", "Room Leader")],
+                residual_risk="Medium",
+            )
+            for i in range(hazard_count)
+        ],
+    )
+
+
+def render_bytes(assessment, fmt):
+    return b"".join(render(assessment, fmt))
+
+
+def check_pdf_structure(data):
+    """Check every xref offset points at its object header; return page count."""
+    startxref = int(re.search(rb"startxref\n(\d+)\n%%EOF\n$", data).group(1))
+    assert data[startxref:].startswith(b"xref\n")
+
+    size = int(re.match(rb"xref\n0 (\d+)\n", data[startxref:]).group(1))
+    entries = re.findall(rb"(\d{10}) 00000 n \n", data[startxref:])
+    assert len(entries) == size - 1
+    for obj_id, offset in enumerate(entries, 1):
+        assert data[int(offset):].startswith(b"%d 0 obj\n" % obj_id)
+
+    pages = re.search(rb"/Type /Pages /Kids \[([^\]]*)\] /Count (\d+)", data)
+    assert len(pages.group(1).split(b" R")) - 1 == int(pages.group(2))
+    return int(pages.group(2))
+
+
+def test_pdf_xref_offsets_and_page_count():
+    data = render_bytes(make_assessment(hazard_count=1), "pdf")
+
+    assert data.startswith(b"%PDF-1.4")
+    assert check_pdf_structure(data) == 1
+
+
+def test_pdf_long_assessment_spans_pages():
+    data = render_bytes(make_assessment(hazard_count=40), "pdf")
+
+    assert check_pdf_structure(data) > 1
+
+
+def test_pdf_writer_streams_pages_in_order():
+    writer = _PdfWriter()
+    layout = _PdfLayout()
+    chunks = [writer.header()]
+    for _ in range(3):
+        layout.text("Page")
+        layout.break_page()
+        chunks.extend(writer.page(content) for content in layout.take_pages())
+    chunks.append(writer.trailer())
+
+    assert writer.page_ids == [6, 8, 10]
+    assert check_pdf_structure(b"".join(chunks)) == 3
+
+
+def test_json_round_trips_through_from_dict():
+    assessment = make_assessment()
+    data = json.loads(render_bytes(assessment, "json"))
+
+    assert RiskAssessment.from_dict(data).to_dict() == assessment.to_dict()
+
+
+def test_csv_has_one_row_per_hazard():
+    data = render_bytes(make_assessment(), "csv").decode("utf-8-sig")
+    rows = list(csv.reader(io.StringIO(data)))
+
+    assert len(rows) == 4
+    assert rows[1][5] == "Hazard 0 (with brackets)"
+    assert rows[1][11] == "Hi-vis vests (Room Leader)"
+
+
+def test_view_computes_colours_once_per_level():
+    view = AssessmentView.from_assessment(make_assessment())
+
+    assert view.hazards[0].risk_color is view.hazards[1].risk_color
+    assert str(view.overall_color) == "DC3545"
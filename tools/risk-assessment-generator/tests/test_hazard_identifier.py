@@ -0,0 +1,252 @@
+"""Tests for hazard identification response handling."""
+
+import json
+from unittest.mock import MagicMock
+
+import anthropic
+import pytest
+
+from risk_assessment_generator.hazard_identifier import HazardIdentifier
+from risk_assessment_generator.models import (
+    AgeGroup,
+    Hazard,
+    HazardWithMitigation,
+    Likelihood,
+    MitigationStrategy,
+    RiskAssessment,
+    Severity,
+)
+
+
+def make_hazard(description, severity="Medium", likelihood="Possible"):
+    return {
+        "description": description,
+        "severity": severity,
+        "likelihood": likelihood,
+        "who_at_risk": "Children",
+        "existing_controls": ["Supervision"],
+        "additional_controls": [{"action": "Check area", "responsible_person": "Room Leader"}],
+        "residual_risk": "Low",
+    }
+
+
+def make_response(data, stop_reason="end_turn"):
+    response = MagicMock()
+    response.content = [MagicMock(text=json.dumps(data))]
+    response.stop_reason = stop_reason
+    response.usage.input_tokens = 100
+    response.usage.output_tokens = 50
+    return response
+
+
+def make_error(error_class):
+    """Create an SDK error without building an HTTP request or response."""
+    error = error_class.__new__(error_class)
+    Exception.__init__(error, "API error")
+    return error
+
+
+@pytest.fixture
+def identifier():
+    identifier = HazardIdentifier(api_key="test-key")
+    identifier.client = MagicMock()
+    return identifier
+
+
+@pytest.fixture
+def assessment():
+    return RiskAssessment(
+        activity_name="Water Play",
+        activity_description="Pouring water between cups",
+        location="Garden",
+        age_groups=[AgeGroup.TODDLER],
+        hazards=[
+            HazardWithMitigation(
+                hazard=Hazard(f"Hazard {i}", Severity.MEDIUM, Likelihood.POSSIBLE, "Children"),
+                existing_controls=[f"Existing {i}"],
+                additional_controls=[MitigationStrategy(f"Action {i}", "Room Leader")],
+            )
+            for i in range(3)
+        ],
+    )
+
+
+def test_apply_delta_modifies_then_removes_then_adds(identifier, assessment):
+    delta = {
+        "modified": [{"index": 2, "severity": "High"}],
+        "removed": [0],
+        "added": [make_hazard("New hazard")],
+    }
+
+    identifier._apply_delta(assessment, delta)
+
+    descriptions = [hwm.hazard.description for hwm in assessment.hazards]
+    assert descriptions == ["Hazard 1", "Hazard 2", "New hazard"]
+    # Index 2 referred to the original list, before the removal shifted it
+    assert assessment.hazards[1].hazard.severity == Severity.HIGH
+
+
+def test_delta_prompt_includes_current_controls(identifier, assessment):
+    identifier.client.messages.create.return_value = make_response({"removed": [0]})
+
+    identifier.update_assessment(assessment, activity_description="Pouring and splashing")
+
+    prompt = identifier.client.messages.create.call_args.kwargs["messages"][0]["content"]
+    assert "Existing controls: Existing 1" in prompt
+    assert "Additional controls: Action 2 (Room Leader)" in prompt
+    assert len(assessment.hazards) == 2
+    assert assessment.activity_description == "Pouring and splashing"
+
+
+def test_invalid_delta_leaves_assessment_unchanged(identifier, assessment):
+    bad_delta = {"modified": [{"index": 0, "severity": "Extreme"}]}
+    identifier.client.messages.create.return_value = make_response(bad_delta)
+
+    with pytest.raises(ValueError):
+        identifier.update_assessment(assessment, activity_description="Changed")
+
+    assert assessment.activity_description == "Pouring water between cups"
+    assert assessment.hazards[0].hazard.severity == Severity.MEDIUM
+
+
+def test_delta_rejects_non_list_existing_controls(identifier):
+    delta = {"modified": [{"index": 0, "existing_controls": "Supervision"}]}
+    assert identifier._validate_delta(delta, hazard_count=1) is not None
+
+
+@pytest.mark.parametrize("delta", [
+    {"modified": [{"index": "1", "severity": "High"}]},
+    {"modified": [{"index": 3, "severity": "High"}]},
+    {"modified": [{"severity": "High"}]},
+    {"removed": [-1]},
+    {"removed": [True]},
+])
+def test_delta_rejects_invalid_indices(identifier, assessment, delta):
+    identifier.client.messages.create.return_value = make_response(delta)
+
+    with pytest.raises(ValueError):
+        identifier.update_assessment(assessment, activity_name="Messy Play")
+
+    assert assessment.activity_name == "Water Play"
+
+
+def test_connection_error_falls_back_to_rule_engine(identifier):
+    identifier.client.messages.create.side_effect = make_error(anthropic.APIConnectionError)
+
+    assessment = identifier.identify_hazards("Sand Play", "Digging in the sand tray")
+
+    assert assessment.is_rule_based
+    assert assessment.hazards
+
+
+def test_connection_error_is_raised_when_no_rules_match(identifier):
+    identifier.client.messages.create.side_effect = make_error(anthropic.APIConnectionError)
+
+    with pytest.raises(anthropic.APIConnectionError):
+        identifier.identify_hazards("Story time", "Reading a book on the carpet")
+
+
+def test_authentication_error_is_not_masked_by_fallback(identifier):
+    identifier.client.messages.create.side_effect = make_error(anthropic.AuthenticationError)
+
+    with pytest.raises(anthropic.AuthenticationError):
+        identifier.identify_hazards("Sand Play", "Digging in the sand tray")
+
+
+def test_few_hazards_escalate_without_counting_as_failure(identifier):
+    hazards = [make_hazard(f"Hazard {i}") for i in range(4)]
+    identifier.client.messages.create.side_effect = [
+        make_response({"hazards": hazards[:2]}),
+        make_response({"hazards": hazards}),
+    ]
+
+    data = identifier._complete(
+        "prompt", 0, 2000, identifier._validate_hazards,
+        incomplete=identifier._too_few_hazards,
+    )
+
+    assert len(data["hazards"]) == 4
+    stats = identifier.router.summary()
+    assert stats["small"]["escalations"] == 1
+    assert stats["small"]["failures"] == 0
+
+
+def test_valid_output_with_few_hazards_is_returned_at_last_tier(identifier):
+    identifier.client.messages.create.return_value = make_response(
+        {"hazards": [make_hazard("Only hazard")]}
+    )
+
+    data = identifier._complete(
+        "prompt", 2, 2000, identifier._validate_hazards,
+        incomplete=identifier._too_few_hazards,
+    )
+
+    assert len(data["hazards"]) == 1
+    assert identifier.router.summary()["large"]["failures"] == 0
+
+
+def test_api_error_during_escalation_keeps_earlier_valid_output(identifier):
+    identifier.client.messages.create.side_effect = [
+        make_response({"hazards": [make_hazard("Hazard A"), make_hazard("Hazard B")]}),
+        make_error(anthropic.NotFoundError),
+    ]
+
+    data = identifier._complete(
+        "prompt", 1, 2000, identifier._validate_hazards,
+        incomplete=identifier._too_few_hazards,
+    )
+
+    assert [h["description"] for h in data["hazards"]] == ["Hazard A", "Hazard B"]
+    assert identifier.router.summary()["large"]["failures"] == 1
+
+
+def test_invalid_output_on_every_tier_raises(identifier):
+    identifier.client.messages.create.return_value = make_response({"hazards": "none"})
+
+    with pytest.raises(ValueError, match="failed validation"):
+        identifier._complete("prompt", 0, 2000, identifier._validate_hazards)
+    assert identifier.router.summary()["large"]["failures"] == 1
+
+
+def test_transient_error_after_invalid_output_falls_back(identifier):
+    identifier.client.messages.create.side_effect = [
+        make_response({"hazards": "none"}, stop_reason="max_tokens"),
+        make_error(anthropic.InternalServerError),
+    ]
+
+    assessment = identifier.identify_hazards("Sand Play", "Digging in the sand tray")
+
+    assert assessment.is_rule_based
+
+
+def test_request_stats_cover_escalations(identifier):
+    hazards = [make_hazard(f"Hazard {i}") for i in range(4)]
+    identifier.client.messages.create.side_effect = [
+        make_response({"hazards": hazards[:2]}),
+        make_response({"hazards": hazards}),
+    ]
+
+    identifier._complete(
+        "prompt", 0, 2000, identifier._validate_hazards,
+        incomplete=identifier._too_few_hazards,
+    )
+
+    stats = identifier.router.request_summary()["small"]
+    assert stats["requests"] == 1
+    assert stats["escalated"] == 1
+    assert stats["failures"] == 0
+    assert stats["input_tokens"] == 200
+    assert stats["median_latency_ms"] is not None
+    small, medium = identifier.router.tiers[:2]
+    assert stats["estimated_cost_usd"] == round(small.cost(100, 50) + medium.cost(100, 50), 4)
+
+
+def test_request_stats_record_failed_requests(identifier):
+    identifier.client.messages.create.side_effect = make_error(anthropic.AuthenticationError)
+
+    with pytest.raises(anthropic.AuthenticationError):
+        identifier._complete("prompt", 1, 2000, identifier._validate_hazards)
+
+    stats = identifier.router.request_summary()["medium"]
+    assert stats["requests"] == 1
+    assert stats["failures"] == 1
@@ -0,0 +1,61 @@
+"""Tests for model tier routing."""
+
+from risk_assessment_generator.model_router import MODEL_TIERS, ModelRouter, configured_tiers
+from risk_assessment_generator.models import AgeGroup
+
+
+def test_simple_activity_with_all_ages_routes_to_small_tier():
+    decision = ModelRouter().route("Story time", "Reading a book on the carpet")
+
+    assert decision.tier_index == 0
+    assert decision.score == 0
+
+
+def test_several_age_groups_and_detail_route_to_medium_tier():
+    description = " ".join(["Children take turns building towers with blocks"] * 4)
+
+    decision = ModelRouter().route(
+        "Block play",
+        description,
+        age_groups=[AgeGroup.BABY, AgeGroup.TODDLER, AgeGroup.PRESCHOOL],
+    )
+
+    assert decision.tier_index == 1
+
+
+def test_long_outing_routes_to_large_tier():
+    description = " ".join(["We walk to the park along the main road holding hands"] * 7)
+
+    decision = ModelRouter().route("Park outing", description, location="Local park")
+
+    assert decision.tier_index == 2
+    assert "off-site outing" in decision.reasons
+
+
+def test_well_recognised_activity_stays_small():
+    description = " ".join(["Children splash in the water tray and paint with brushes"] * 3)
+
+    decision = ModelRouter().route("Water and paint", description)
+
+    assert decision.confidence == 1.0
+    assert decision.tier_index == 0
+
+
+def test_detailed_unrecognised_activity_routes_up():
+    description = " ".join(["We sit together and talk about our feelings quietly"] * 3)
+
+    decision = ModelRouter().route("Circle time", description)
+
+    assert decision.confidence == 0
+    assert decision.tier_index == 1
+
+
+def test_model_ids_can_be_overridden_from_environment(monkeypatch):
+    monkeypatch.setenv("RISK_ASSESSMENT_LARGE_MODEL", "claude-opus-test")
+
+    tiers = ModelRouter().tiers
+
+    assert tiers[2].model == "claude-opus-test"
+    assert tiers[2].input_cost == MODEL_TIERS[2].input_cost
+    assert tiers[:2] == MODEL_TIERS[:2]
+    assert configured_tiers(environ={}) == MODEL_TIERS
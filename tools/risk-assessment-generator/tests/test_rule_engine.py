@@ -0,0 +1,65 @@
+"""Tests for the offline rule engine."""
+
+import pytest
+
+from risk_assessment_generator.models import AgeGroup
+from risk_assessment_generator.rule_engine import KeywordIndex, RuleEngine
+
+
+def test_keyword_index_matches_whole_words_only():
+    index = KeywordIndex({"pool": [0], "sand": [1]})
+
+    assert index.search("Paddling pool in the garden") == {0}
+    assert index.search("Pooling resources, sandals and thousands") == set()
+    assert index.search("POOL, sand.") == {0, 1}
+
+
+def test_keyword_index_matches_multi_word_and_overlapping_keywords():
+    index = KeywordIndex({"water": [0], "water play": [1], "play": [2], "blind cord": [3]})
+
+    assert index.search("Outdoor water play") == {0, 1, 2}
+    assert index.search("Check the blind cord") == {3}
+    assert index.search("blind cords") == set()
+
+
+def test_rules_respect_age_groups():
+    engine = RuleEngine()
+    text = "Threading beads"
+
+    under_threes = [rule.name for rule in engine.match_rules(text, [AgeGroup.TODDLER])]
+    over_threes = [rule.name for rule in engine.match_rules(text, [AgeGroup.RECEPTION])]
+    all_ages = [rule.name for rule in engine.match_rules(text, [AgeGroup.ALL])]
+
+    assert "choking" in under_threes
+    assert "choking" not in over_threes
+    assert "choking" in all_ages
+
+
+def test_identify_hazards_builds_rule_based_draft():
+    assessment = RuleEngine().identify_hazards(
+        activity_name="Water Play",
+        activity_description="Pouring water between cups",
+        location="Main Room",
+        age_groups=[AgeGroup.BABY],
+    )
+
+    assert assessment.is_rule_based
+    assert any("Drowning" in hwm.hazard.description for hwm in assessment.hazards)
+    assert "1 adult to 3 children" in assessment.additional_notes
+    assert "3.5m² per child" in assessment.additional_notes
+
+
+def test_identify_hazards_refuses_unrecognised_activity():
+    with pytest.raises(ValueError):
+        RuleEngine().identify_hazards("Story time", "Reading a book on the carpet")
+
+
+@pytest.mark.parametrize("location, indoor", [
+    ("Springfield Nursery", True),
+    ("Parkview Room", True),
+    ("Nursery garden", False),
+])
+def test_space_note_uses_whole_word_outdoor_keywords(location, indoor):
+    assessment = RuleEngine().identify_hazards("Water Play", "Pouring water", location=location)
+
+    assert ("Indoor space requirements" in assessment.additional_notes) == indoor
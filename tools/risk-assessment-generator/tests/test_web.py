@@ -0,0 +1,92 @@
+"""Tests for the Flask web application."""
+
+from urllib.parse import unquote
+
+import pytest
+
+from risk_assessment_generator import web
+from risk_assessment_generator.rule_engine import RuleEngine
+
+
+@pytest.fixture
+def client():
+    web.app.config["TESTING"] = True
+    return web.app.test_client()
+
+
+def store(activity_name="Water Play"):
+    assessment = RuleEngine().identify_hazards(activity_name, "Pouring water and threading beads")
+    return web.store_assessment(assessment)
+
+
+@pytest.mark.parametrize("fmt", ["docx", "pdf", "csv"])
+def test_download_encodes_non_ascii_filenames(client, fmt):
+    assessment_id = store('Café trip “x” "q"')
+
+    response = client.get(f"/download/{assessment_id}?format={fmt}")
+
+    assert response.status_code == 200
+    disposition = response.headers["Content-Disposition"]
+    disposition.encode("latin-1")
+    assert "filename*=UTF-8''" in disposition
+    encoded = disposition.split("filename*=UTF-8''")[1]
+    assert unquote(encoded) == f'risk_assessment_café_trip_“x”_"q".{fmt}'
+
+
+def test_pending_flash_is_not_cached_for_other_clients(client):
+    assessment_id = store("Sand Play")
+    with client.session_transaction() as sess:
+        sess["_flashes"] = [("info", "Only for this session")]
+
+    first = client.get(f"/assessment/{assessment_id}", headers={"Accept-Encoding": "identity"})
+    other = web.app.test_client().get(
+        f"/assessment/{assessment_id}", headers={"Accept-Encoding": "identity"}
+    )
+
+    assert b"Only for this session" in first.data
+    assert b"Only for this session" not in other.data
+
+
+def test_result_returns_304_for_current_etag(client):
+    assessment_id = store("Painting")
+    first = client.get(f"/assessment/{assessment_id}")
+
+    second = client.get(
+        f"/assessment/{assessment_id}", headers={"If-None-Match": first.headers["ETag"]}
+    )
+
+    assert second.status_code == 304
+    assert second.data == b""
+    assert second.headers["Vary"] == first.headers["Vary"]
+    assert "Accept-Encoding" in second.headers["Vary"]
+
+
+def test_pending_flash_is_shown_instead_of_304(client):
+    assessment_id = store("Painting")
+    first = client.get(f"/assessment/{assessment_id}")
+    with client.session_transaction() as sess:
+        sess["_flashes"] = [("info", "Saved")]
+
+    second = client.get(
+        f"/assessment/{assessment_id}",
+        headers={"If-None-Match": first.headers["ETag"], "Accept-Encoding": "identity"},
+    )
+
+    assert second.status_code == 200
+    assert b"Saved" in second.data
+    assert "ETag" not in second.headers
+    with client.session_transaction() as sess:
+        assert "_flashes" not in sess
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = web.LRUCache(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache.get("a")
+    cache["c"] = 3
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3